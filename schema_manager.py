@@ -16,10 +16,25 @@ Usage:
     manager.save('config/updated_schema.yaml')
 """
 
+import json
+import logging
+import os
+import pickle
 import yaml
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 
+try:
+    from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+except ImportError:
+    from yaml import SafeLoader as Loader, SafeDumper as Dumper
+
+logger = logging.getLogger(__name__)
+
+# Marks a missing key in single-lookup dict access (schema values may be None)
+_MISSING = object()
+
 
 class SchemaManager:
     """
@@ -45,10 +60,129 @@ class SchemaManager:
         if not self.path.exists():
             raise FileNotFoundError(f"Schema file not found: {self.path}")
         
-        with open(self.path, 'r') as f:
-            self.schema = yaml.safe_load(f) or {}
+        self.schema = self._load_schema()
+        self._build_children_index()
+        
+        logger.info("Loaded schema from: %s", self.path)
+    
+    def _load_schema(self) -> Dict[str, Any]:
+        """
+        Load the schema, preferring a fresh pickle sidecar over parsing YAML.
+        
+        The sidecar (``<schema>.pkl``) stores the YAML file's mtime and size;
+        it is only used while both still match, otherwise the YAML is parsed
+        and the sidecar rewritten.
+        
+        Returns:
+            The schema dictionary
+        """
+        stat = self.path.stat()
+        cache_path = self.path.with_suffix(self.path.suffix + '.pkl')
+        try:
+            mtime_ns, size, schema = pickle.loads(cache_path.read_bytes())
+            if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+                return schema
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # Any damaged sidecar (truncated, foreign pickle, ...) falls back to the YAML
+            logger.warning("Ignoring unreadable schema cache %s: %s", cache_path, e)
+        
+        # Read the whole file at once; libyaml detects the encoding from bytes
+        schema = yaml.load(self.path.read_bytes(), Loader=Loader) or {}
+        
+        payload = pickle.dumps((stat.st_mtime_ns, stat.st_size, schema), protocol=5)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # The cache is optional, e.g. the schema directory may be read-only
+            tmp_path.unlink(missing_ok=True)
+        return schema
+    
+    def _build_children_index(self) -> None:
+        """Build the parent -> children index and root list in one pass over the schema."""
+        self._children_index: Dict[str, list[str]] = defaultdict(list)
+        self._roots: list[str] = []
+        for name, config in self.schema.items():
+            if isinstance(config, dict):
+                if 'is_a' in config:
+                    self._children_index[config['is_a']].append(name)
+                else:
+                    self._roots.append(name)
+    
+    def _index_children(self, parent: str, children: list[str], reparented: bool) -> None:
+        """
+        Add children to parent's index entry, keeping the entry in schema order.
         
-        print(f"Loaded schema from: {self.path}")
+        New nodes are appended to the schema dict, so appending them keeps the
+        order; an overwritten node keeps its original schema position, so when
+        one is re-parented the entry is re-sorted by schema position.
+        """
+        siblings = self._children_index[parent]
+        siblings.extend(children)
+        if reparented:
+            position = {name: i for i, name in enumerate(self.schema)}
+            siblings.sort(key=position.__getitem__)
+    
+    def _unlink_child(self, child: str, config: Any) -> None:
+        """Drop a child (with node configuration config) from its parent's index entry."""
+        if isinstance(config, dict) and 'is_a' in config:
+            siblings = self._children_index.get(config['is_a'])
+            if siblings and child in siblings:
+                siblings.remove(child)
+    
+    def _get_parent_node(self, parent: str) -> Dict[str, Any]:
+        """Return the configuration of parent, raising ValueError if it is missing."""
+        parent_node = self.schema.get(parent)
+        if parent_node is None:
+            available = ', '.join(self.schema.keys())
+            raise ValueError(
+                f"Parent node '{parent}' not found in schema. "
+                f"Available nodes: {available}"
+            )
+        return parent_node
+    
+    @staticmethod
+    def _make_node(
+        parent: str,
+        parent_node: Dict[str, Any],
+        child: str,
+        inherit_properties: bool = True,
+        properties: Optional[Dict[str, str]] = None,
+        input_label: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the configuration dict of a child node of parent."""
+        child_node = {
+            'is_a': parent,
+            'inherit_properties': inherit_properties,
+            'represented_as': parent_node.get('represented_as', 'node'),
+            'input_label': input_label or child
+        }
+        
+        # Add properties if provided
+        if properties:
+            child_node['properties'] = properties
+        return child_node
+    
+    def _release_existing(self, child: str, parent: str) -> bool:
+        """
+        Detach an existing node that is about to be overwritten by a child of parent.
+        
+        Returns:
+            True if child still has to be added to parent's children index
+        """
+        existing = self.schema.get(child, _MISSING)
+        if existing is _MISSING:
+            return True
+        logger.warning("Overwriting existing node '%s'", child)
+        if child in self._roots:
+            self._roots.remove(child)
+        if isinstance(existing, dict) and existing.get('is_a') == parent:
+            return False
+        self._unlink_child(child, existing)
+        return True
     
     def add_child(
         self,
@@ -74,54 +208,46 @@ class SchemaManager:
         Raises:
             ValueError: If parent node doesn't exist
         """
-        # Validate parent exists
-        if parent not in self.schema:
-            available = ', '.join(self.schema.keys())
-            raise ValueError(
-                f"Parent node '{parent}' not found in schema. "
-                f"Available nodes: {available}"
-            )
-        
-        # Get parent configuration
-        parent_node = self.schema[parent]
-        represented_as = parent_node.get('represented_as', 'node')
-        
-        # Build child node
-        child_node = {
-            'is_a': parent,
-            'inherit_properties': inherit_properties,
-            'represented_as': represented_as,
-            'input_label': input_label or child
-        }
-        
-        # Add properties if provided
-        if properties:
-            child_node['properties'] = properties
+        parent_node = self._get_parent_node(parent)
+        child_node = self._make_node(
+            parent, parent_node, child, inherit_properties, properties, input_label
+        )
         
         # Add to schema
-        if child in self.schema:
-            print(f"  Warning: Overwriting existing node '{child}'")
-        
+        existed = child in self.schema
+        reparent = self._release_existing(child, parent)
         self.schema[child] = child_node
-        print(f"  Added: {child} (child of {parent})")
+        if reparent:
+            self._index_children(parent, [child], reparented=existed)
+        logger.info("Added: %s (child of %s)", child, parent)
         
         return self  # Enable method chaining
     
     def add_children(
         self,
         parent: str,
-        children: list[Union[str, tuple[str, Dict[str, Any]]]]
+        children: list[Union[str, tuple[str, Dict[str, Any]]]],
+        verbose: bool = True
     ) -> 'SchemaManager':
         """
         Add multiple child nodes to the same parent.
         
+        The parent is validated once and all child nodes are built before any
+        is inserted, so an invalid specification leaves the schema unchanged;
+        the nodes are then added with a single dict update.
+        
         Args:
             parent: Name of the parent node
             children: List of child names or tuples of (name, kwargs_dict)
+            verbose: Log each added child at INFO level (default: True)
         
         Returns:
             Self for method chaining
         
+        Raises:
+            ValueError: If parent node doesn't exist
+            TypeError: If a child specification has unexpected keyword arguments
+        
         Examples:
             manager.add_children('physical entity', [
                 'protein',
@@ -129,15 +255,34 @@ class SchemaManager:
                 ('macromolecule', {'properties': {'weight': 'float'}})
             ])
         """
+        parent_node = self._get_parent_node(parent)
+        batch: Dict[str, Dict[str, Any]] = {}
         for child_spec in children:
             if isinstance(child_spec, str):
-                self.add_child(parent, child_spec)
+                child_name, kwargs = child_spec, {}
             elif isinstance(child_spec, tuple) and len(child_spec) == 2:
                 child_name, kwargs = child_spec
-                self.add_child(parent, child_name, **kwargs)
             else:
-                print(f"  Warning: Skipping invalid child specification: {child_spec}")
-        
+                logger.warning("Skipping invalid child specification: %s", child_spec)
+                continue
+            
+            child_node = self._make_node(parent, parent_node, child_name, **kwargs)
+            if child_name in batch:
+                logger.warning("Overwriting existing node '%s'", child_name)
+            batch[child_name] = child_node
+        
+        # Every node is built before the schema or its index is touched
+        new_children: list[str] = []
+        reparented = False
+        for child_name in batch:
+            if self._release_existing(child_name, parent):
+                new_children.append(child_name)
+                reparented = reparented or child_name in self.schema
+            if verbose:
+                logger.info("Added: %s (child of %s)", child_name, parent)
+        
+        self.schema.update(batch)
+        self._index_children(parent, new_children, reparented)
         return self
     
     def remove_child(self, child: str) -> 'SchemaManager':
@@ -150,11 +295,14 @@ class SchemaManager:
         Returns:
             Self for method chaining
         """
-        if child in self.schema:
-            del self.schema[child]
-            print(f"  Removed: {child}")
+        config = self.schema.pop(child, _MISSING)
+        if config is not _MISSING:
+            self._unlink_child(child, config)
+            if child in self._roots:
+                self._roots.remove(child)
+            logger.info("Removed: %s", child)
         else:
-            print(f"  Warning: Node '{child}' not found")
+            logger.warning("Node '%s' not found", child)
         
         return self
     
@@ -180,11 +328,7 @@ class SchemaManager:
         Returns:
             List of child node names
         """
-        children = []
-        for name, config in self.schema.items():
-            if isinstance(config, dict) and config.get('is_a') == parent:
-                children.append(name)
-        return children
+        return list(self._children_index.get(parent, ()))
     
     def list_nodes(self, node_type: Optional[str] = None) -> list[str]:
         """
@@ -212,6 +356,9 @@ class SchemaManager:
         """
         Save the schema to a file.
         
+        Paths ending in ``.json`` are written as JSON (much faster to dump and
+        reload, and still valid YAML); anything else is written as YAML.
+        
         Args:
             output_path: Path to save to (defaults to original path)
             backup: Create backup of existing file (default: False)
@@ -227,55 +374,90 @@ class SchemaManager:
                 # Use current working directory for relative paths
                 output_path = Path.cwd() / output_path
         
+        as_json = output_path.suffix.lower() == '.json'
+        
         # Create backup if requested and file exists
         if backup and output_path.exists():
-            backup_path = output_path.with_suffix('.yaml.bak')
+            backup_path = output_path.with_suffix('.json.bak' if as_json else '.yaml.bak')
             output_path.rename(backup_path)
-            print(f"Backup created: {backup_path}")
+            logger.info("Backup created: %s", backup_path)
         
         # Ensure parent directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Save schema
-        with open(output_path, 'w') as f:
-            yaml.dump(
+        if as_json:
+            payload = json.dumps(self.schema, indent=2, ensure_ascii=False)
+        else:
+            payload = yaml.dump(
                 self.schema,
-                f,
+                Dumper=Dumper,
                 default_flow_style=False,
                 sort_keys=False,
                 allow_unicode=True
             )
+        output_path.write_bytes(payload.encode('utf-8'))
         
-        print(f"Schema saved to: {output_path}")
+        logger.info("Schema saved to: %s", output_path)
         return output_path
     
+    def save_json(
+        self,
+        output_path: Optional[Union[str, Path]] = None,
+        backup: bool = False
+    ) -> Path:
+        """
+        Save the schema as JSON.
+        
+        Args:
+            output_path: Path to save to (defaults to the original path); a
+                suffix other than .json is replaced with .json
+            backup: Create backup of existing file (default: False)
+        
+        Returns:
+            Path where schema was saved
+        """
+        if output_path is None:
+            output_path = self.path.with_suffix('.json')
+        else:
+            output_path = Path(output_path)
+            if output_path.suffix.lower() != '.json':
+                output_path = output_path.with_suffix('.json')
+        return self.save(output_path, backup=backup)
+    
     def print_tree(self, parent: Optional[str] = None, indent: int = 0) -> None:
         """
         Print the schema as a tree structure.
         
+        The tree is assembled in memory and written with a single print call.
+        
         Args:
             parent: Start from this parent (None = show root nodes)
-            indent: Current indentation level (for recursion)
+            indent: Indentation level of the children of parent
         """
+        lines: list[str] = []
         if parent is None:
             # Show root nodes (those without 'is_a')
-            print("\nSchema Tree:")
-            print("=" * 50)
-            for name, config in self.schema.items():
-                if isinstance(config, dict) and 'is_a' not in config:
-                    node_type = config.get('represented_as', 'unknown')
-                    print(f"{name} [{node_type}]")
-                    self.print_tree(name, indent=2)
+            lines.append("\nSchema Tree:")
+            lines.append("=" * 50)
+            for name in self._roots:
+                node_type = self.schema[name].get('represented_as', 'unknown')
+                lines.append(f"{name} [{node_type}]")
+                self._tree_lines(name, 2, lines)
         else:
-            # Show children of parent
-            children = self.get_children(parent)
-            for child in children:
-                config = self.schema[child]
-                node_type = config.get('represented_as', 'unknown')
-                props = config.get('properties', {})
-                props_str = f" ({', '.join(props.keys())})" if props else ""
-                print(f"{' ' * indent}├─ {child} [{node_type}]{props_str}")
-                self.print_tree(child, indent=indent+2)
+            self._tree_lines(parent, indent, lines)
+        if lines:
+            print("\n".join(lines))
+    
+    def _tree_lines(self, parent: str, indent: int, lines: list[str]) -> None:
+        """Append the subtree below parent to lines, one line per node."""
+        for child in self._children_index.get(parent, ()):
+            config = self.schema[child]
+            node_type = config.get('represented_as', 'unknown')
+            props = config.get('properties', {})
+            props_str = f" ({', '.join(props.keys())})" if props else ""
+            lines.append(f"{' ' * indent}├─ {child} [{node_type}]{props_str}")
+            self._tree_lines(child, indent + 2, lines)
     
     def __repr__(self) -> str:
         """String representation of the schema manager."""
@@ -285,6 +467,7 @@ class SchemaManager:
 
 def main():
     """Example usage of SchemaManager."""
+    logging.basicConfig(level=logging.INFO, format='  %(message)s')
     
     # Load existing schema
     manager = SchemaManager('config/simple_schema_config.yaml')
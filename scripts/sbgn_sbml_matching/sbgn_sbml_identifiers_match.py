@@ -1,108 +1,285 @@
 #!/usr/bin/env python3
 
+import csv
 import logging
 import os
+import pickle
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
-import pandas as pd
+import numpy as np
 from lxml import etree
 from tqdm.auto import tqdm
 
 DEFAULT_SBGN_DIR = "sbgn_annotated"
 DEFAULT_SBML_DIR = "sbml"
 DEFAULT_OUTPUT_CSV = "sbgn_sbml_identifier_overlap.csv"
+DEFAULT_CACHE_DIR = ".cache/identifiers"
 
 SBGN_DIR = Path(os.environ.get("SBGN_ANNOTATED_DIR", DEFAULT_SBGN_DIR))
 SBML_DIR = Path(os.environ.get("SBML_DIR", DEFAULT_SBML_DIR))
 OUTPUT_CSV = Path(os.environ.get("IDENTIFIER_MATCH_CSV", DEFAULT_OUTPUT_CSV))
+SKIP_EMPTY_OVERLAPS = os.environ.get("SKIP_EMPTY_OVERLAPS", "").lower() in ("1", "true", "yes")
+SORT_OVERLAP_URLS = os.environ.get("SORT_OVERLAP_URLS", "").lower() in ("1", "true", "yes")
+# Set IDENTIFIER_CACHE_DIR to an empty string to disable the on-disk cache
+CACHE_DIR = os.environ.get("IDENTIFIER_CACHE_DIR", DEFAULT_CACHE_DIR)
+CACHE_FILE = Path(CACHE_DIR) / "identifiers.pkl" if CACHE_DIR else None
+
+# Resolved file path -> (size, mtime_ns, identifiers.org URIs)
+IdentifierCache = Dict[str, Tuple[int, int, FrozenSet[str]]]
+
+OVERLAP_COLUMNS = (
+    "sbml_file",
+    "sbgn_file",
+    "sbml_identifier_count",
+    "sbgn_identifier_count",
+    "overlap_count",
+    "overlap_urls",
+)
+CSV_WRITE_BUFFER = 1 << 20
 
 IDENTIFIER_PREFIXES = ("http://identifiers.org/", "https://identifiers.org/")
-XML_PARSER = etree.XMLParser(remove_comments=True, recover=True)
+
+# Shared identifier vocabulary: every URI is stored once and sets hold its int id
+VOCAB: Dict[str, int] = {}
+INV: List[str] = []
 
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
 logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
 
+def iter_matching_files(directory: Path, suffixes: Tuple[str, ...]) -> Iterator[Path]:
+    """Walk directory with os.scandir and yield only files ending in one of suffixes.
+
+    suffixes must be lower case; the name check happens before a Path is built.
+    Symlinked directories are not descended into, matching Path.rglob.
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                    yield Path(entry.path)
+
+
 def list_files(directory: Path, suffixes: Tuple[str, ...]) -> List[Path]:
     """Return files in directory whose suffix matches suffixes (case-insensitive)."""
     if not directory.exists():
         raise FileNotFoundError(f"Directory not found: {directory}")
     suffixes = tuple(s.lower() for s in suffixes)
-    files = sorted(
-        path
-        for path in directory.rglob("*")
-        if path.is_file() and path.suffix.lower() in suffixes
-    )
+    files = sorted(iter_matching_files(directory, suffixes))
     logger.info("Discovered %d files in %s", len(files), directory)
     return files
 
 
 def extract_identifiers(file_path: Path) -> Set[str]:
-    """Parse XML file and collect identifiers.org URIs."""
+    """Stream an XML file and collect identifiers.org URIs.
+
+    Elements are cleared as soon as their attributes have been scanned, so
+    peak memory stays bounded instead of holding the whole document tree.
+    """
     identifiers: Set[str] = set()
     try:
-        tree = etree.parse(str(file_path), parser=XML_PARSER)
+        for _, elem in etree.iterparse(
+            str(file_path), events=("end",), remove_comments=True, recover=True
+        ):
+            for value in elem.attrib.values():
+                if not value:
+                    continue
+                # Only strip values that actually carry surrounding whitespace
+                if value[0].isspace() or value[-1].isspace():
+                    value = value.strip()
+                if value.startswith(IDENTIFIER_PREFIXES):
+                    identifiers.add(value)
+            elem.clear(keep_tail=True)
+            # Drop already processed siblings still referenced by the parent
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
     except etree.XMLSyntaxError as exc:
         logger.warning("Failed to parse %s: %s", file_path, exc)
-        return identifiers
-
-    for elem in tree.iter():
-        for attr_value in elem.attrib.values():
-            if not attr_value:
-                continue
-            attr_str = str(attr_value).strip()
-            if attr_str.startswith(IDENTIFIER_PREFIXES):
-                identifiers.add(attr_str)
+        return set()
     return identifiers
 
 
-def load_identifier_sets(directory: Path, suffixes: Tuple[str, ...]) -> Dict[str, Set[str]]:
-    """Load all files under directory and map file name to identifiers set."""
+def intern_identifier(uri: str) -> int:
+    """Return the vocabulary id of uri, registering it on first sight."""
+    index = VOCAB.get(uri)
+    if index is None:
+        index = VOCAB[uri] = len(INV)
+        INV.append(uri)
+    return index
+
+
+def read_identifier_cache(cache_file: Optional[Path]) -> IdentifierCache:
+    """Load the on-disk identifier cache, returning an empty cache if unavailable."""
+    if cache_file is None:
+        return {}
+    try:
+        return pickle.loads(cache_file.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except (OSError, pickle.UnpicklingError, EOFError) as exc:
+        logger.warning("Ignoring unreadable identifier cache %s: %s", cache_file, exc)
+        return {}
+
+
+def write_identifier_cache(cache_file: Optional[Path], cache: IdentifierCache) -> None:
+    """Persist the identifier cache atomically."""
+    if cache_file is None:
+        return
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_bytes(pickle.dumps(cache, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp_file, cache_file)
+
+
+def load_identifier_sets(
+    directory: Path, suffixes: Tuple[str, ...], cache: Optional[IdentifierCache] = None
+) -> Dict[str, Set[int]]:
+    """Load all files under directory and map file name to interned identifier ids.
+
+    Files are parsed in parallel worker processes; results keep the sorted
+    file order, and each file's URIs are interned in sorted order, so the
+    vocabulary ids (and the output CSV) do not depend on set iteration or
+    hash randomization. Use INV to decode the ids back to identifiers.org URIs.
+
+    When cache is given, files whose size and mtime match a cached entry are
+    not parsed again, and freshly parsed files are added to it.
+    """
     files = list_files(directory, suffixes)
-    id_map: Dict[str, Set[str]] = {}
-    for file_path in tqdm(files, desc=f"Parsing {directory.name}", unit="file"):
-        id_map[file_path.name] = extract_identifiers(file_path)
-    return id_map
-
-
-def build_overlap_table(sbml_ids: Dict[str, Set[str]], sbgn_ids: Dict[str, Set[str]]) -> pd.DataFrame:
-    """Compute pairwise overlaps between SBML and SBGN identifier sets."""
-    sbgn_items = list(sbgn_ids.items())
-    rows: List[Dict[str, object]] = []
-    for sbml_file, sbml_set in tqdm(sbml_ids.items(), desc="Comparing SBML vs SBGN"):
-        for sbgn_file, sbgn_set in sbgn_items:
-            overlap = sorted(sbml_set & sbgn_set)
-            rows.append(
-                {
-                    "sbml_file": sbml_file,
-                    "sbgn_file": sbgn_file,
-                    "sbml_identifier_count": len(sbml_set),
-                    "sbgn_identifier_count": len(sbgn_set),
-                    "overlap_count": len(overlap),
-                    "overlap_urls": " ".join(overlap),
-                }
+    identifier_lists: List[Optional[FrozenSet[str]]] = [None] * len(files)
+    stale: List[Tuple[int, str, os.stat_result]] = []
+    for position, file_path in enumerate(files):
+        key = str(file_path.resolve())
+        stat = file_path.stat()
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            identifier_lists[position] = cached[2]
+        else:
+            stale.append((position, key, stat))
+    if cache is not None:
+        logger.info("Reusing cached identifiers for %d of %d files", len(files) - len(stale), len(files))
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = executor.map(
+                extract_identifiers, [files[position] for position, _, _ in stale], chunksize=8
             )
-    df = pd.DataFrame(rows)
-    return df
+            for (position, key, stat), identifiers in tqdm(
+                zip(stale, results), total=len(stale), desc=f"Parsing {directory.name}", unit="file"
+            ):
+                identifier_lists[position] = frozenset(identifiers)
+                if cache is not None:
+                    cache[key] = (stat.st_size, stat.st_mtime_ns, identifier_lists[position])
+
+    return {
+        file_path.name: {intern_identifier(uri) for uri in sorted(identifiers)}
+        for file_path, identifiers in zip(files, identifier_lists)
+    }
+
+
+def format_overlap(overlap: Set[int], sort_urls: bool = False) -> str:
+    """Decode interned identifier ids into a space-separated URL string."""
+    if sort_urls:
+        return " ".join(sorted(INV[index] for index in overlap))
+    return " ".join(map(INV.__getitem__, sorted(overlap)))
+
+
+def write_overlap_csv(
+    sbml_ids: Dict[str, Set[int]],
+    sbgn_ids: Dict[str, Set[int]],
+    output_csv: Path,
+    skip_empty: bool = False,
+    sort_overlap_urls: bool = False,
+) -> int:
+    """Stream pairwise overlaps between SBML and SBGN identifier sets to output_csv.
+
+    Rows are written as they are computed, so memory use does not grow with
+    the number of pairs. Pairs without shared identifiers are omitted when
+    skip_empty is set. Returns the number of records written.
+
+    Overlap URLs are listed in vocabulary order (order of first appearance
+    while loading files in sorted order, each file's URIs sorted), which only
+    needs an int sort and is deterministic for a given input. Set
+    sort_overlap_urls to sort them lexically instead.
+
+    Overlap counts come from an inverted index over the SBGN sets (one sparse
+    SBML x SBGN product row per SBML file), so set intersections are only
+    materialized for pairs that actually share identifiers.
+
+    Files with identical identifier sets are grouped: overlaps are computed
+    once per unique (SBML set, SBGN set) pair, written for every file pair in
+    those groups and then discarded. Rows are therefore ordered by SBML group
+    (first appearance), with files in input order within each group.
+    """
+    sbgn_groups: Dict[FrozenSet[int], int] = {}
+    sbgn_items: List[Tuple[str, int, int]] = []
+    for sbgn_file, sbgn_set in sbgn_ids.items():
+        column = sbgn_groups.setdefault(frozenset(sbgn_set), len(sbgn_groups))
+        sbgn_items.append((sbgn_file, len(sbgn_set), column))
+    sbgn_sets = list(sbgn_groups)
+    postings: Dict[int, List[int]] = defaultdict(list)
+    for column, sbgn_set in enumerate(sbgn_sets):
+        for identifier in sbgn_set:
+            postings[identifier].append(column)
+
+    sbml_groups: Dict[FrozenSet[int], List[str]] = defaultdict(list)
+    for sbml_file, sbml_set in sbml_ids.items():
+        sbml_groups[frozenset(sbml_set)].append(sbml_file)
+
+    written = 0
+    with open(output_csv, "w", buffering=CSV_WRITE_BUFFER, newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(OVERLAP_COLUMNS)
+        for sbml_set, sbml_files in tqdm(sbml_groups.items(), desc="Comparing SBML vs SBGN"):
+            hits = [column for identifier in sbml_set for column in postings.get(identifier, ())]
+            counts = np.bincount(np.asarray(hits, dtype=np.intp), minlength=len(sbgn_sets)).tolist()
+            overlap_urls = {
+                column: format_overlap(sbml_set & sbgn_sets[column], sort_overlap_urls)
+                for column, count in enumerate(counts)
+                if count
+            }
+            sbml_len = len(sbml_set)
+            for sbml_file in sbml_files:
+                for sbgn_file, sbgn_len, column in sbgn_items:
+                    count = counts[column]
+                    if not count and skip_empty:
+                        continue
+                    writer.writerow(
+                        (sbml_file, sbgn_file, sbml_len, sbgn_len, count, overlap_urls.get(column, ""))
+                    )
+                    written += 1
+    return written
 
 
 def main() -> None:
     """Entrypoint for computing identifier overlaps."""
+    cache = read_identifier_cache(CACHE_FILE) if CACHE_FILE is not None else None
     logger.info("Loading SBML identifier sets from %s", SBML_DIR)
-    sbml_ids = load_identifier_sets(SBML_DIR, suffixes=(".xml", ".sbml"))
+    sbml_ids = load_identifier_sets(SBML_DIR, suffixes=(".xml", ".sbml"), cache=cache)
     logger.info("Loading SBGN identifier sets from %s", SBGN_DIR)
-    sbgn_ids = load_identifier_sets(SBGN_DIR, suffixes=(".sbgn", ".xml"))
+    sbgn_ids = load_identifier_sets(SBGN_DIR, suffixes=(".sbgn", ".xml"), cache=cache)
+    if cache is not None:
+        write_identifier_cache(CACHE_FILE, cache)
 
     logger.info(
         "Computing pairwise overlaps between %d SBML and %d SBGN files",
         len(sbml_ids),
         len(sbgn_ids),
     )
-    overlap_df = build_overlap_table(sbml_ids, sbgn_ids)
-    overlap_df.to_csv(OUTPUT_CSV, index=False)
-    logger.info("Wrote %d pairwise records to %s", len(overlap_df), OUTPUT_CSV)
+    written = write_overlap_csv(
+        sbml_ids,
+        sbgn_ids,
+        OUTPUT_CSV,
+        skip_empty=SKIP_EMPTY_OVERLAPS,
+        sort_overlap_urls=SORT_OVERLAP_URLS,
+    )
+    logger.info("Wrote %d pairwise records to %s", written, OUTPUT_CSV)
 
 
 if __name__ == "__main__":
@@ -3,20 +3,116 @@ SBGN Adapter
 
 This adapter handles SBGN (Systems Biology Graphical Notation) XML files
 using the momapy library to parse and extract nodes and edges for BioCypher.
+When momapy is not installed, the SBGN-ML file is streamed with lxml instead.
 """
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import logging
-import hashlib
+from collections import defaultdict
+import operator
+import re
+import secrets
+import sys
+from array import array
+from math import nan
 from pathlib import Path
-from typing import Iterator, Tuple, Dict, Any, Optional, List
-import xml.etree.ElementTree as ET
-import momapy.sbgn.io.sbgnml
-import momapy.io
+from typing import Callable, Iterator, Tuple, Dict, Any, Optional, List
+from lxml import etree
 import numpy as np
-import random
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+# Lazy import of momapy, an optional dependency (see the "momapy" extra)
+_MOMAPY_IO = None
+_MOMAPY_AVAILABLE: Optional[bool] = None
+
+# momapy classes carrying units of information (prefix/value) on entity pools
+UOI_TYPES: Tuple[type, ...] = ()
+
+# Entity pool attributes read for every node, with the value used when a class lacks them
+GLYPH_FIELD_DEFAULTS = (
+    ("id_", None),
+    ("label", ""),
+    ("bbox", None),
+    ("orientation", _MISSING),
+    ("units_of_information", ()),
+)
+
+# Parser settings shared by every streaming read; entities are never expanded
+# (no billion-laughs expansion) and nothing is fetched from the network
+ITERPARSE_OPTIONS = dict(
+    remove_comments=True,
+    huge_tree=True,
+    resolve_entities=False,
+    no_network=True,
+)
+
+RDF_NS = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+BQ_NAMESPACES = {
+    "http://biomodels.net/model-qualifiers/": "BQModel",
+    "http://biomodels.net/biology-qualifiers/": "BQBiol",
+}
+
+# SBGN-ML glyph classes handled outside of entity pools when reading the XML directly
+SBGN_PROCESS_CLASSES = frozenset(
+    ("process", "omitted process", "uncertain process", "association", "dissociation", "phenotype")
+)
+SBGN_SKIPPED_CLASSES = frozenset(("and", "or", "not", "equivalence", "tag", "submap", "terminal"))
+SBGN_MODULATION_CLASSES = frozenset(
+    ("modulation", "stimulation", "catalysis", "inhibition", "necessary stimulation",
+     "absolute stimulation", "absolute inhibition")
+)
+
+# Properties shared by every "contained entity" edge; copied, then extended with annotations
+CONTAINED_ENTITY_PROPERTIES = {"sbo_term": "SBO_0000664"}
+
+
+def _import_momapy():
+    """Lazy import of momapy modules."""
+    global _MOMAPY_IO, _MOMAPY_AVAILABLE, UOI_TYPES
+    if _MOMAPY_AVAILABLE is None:
+        try:
+            import momapy.sbgn.io.sbgnml
+            import momapy.sbgn.pd
+            import momapy.io
+        except ImportError as e:
+            logger.warning(
+                f"momapy not available (system dependencies may be missing): {e}. "
+                "Falling back to direct XML parsing."
+            )
+            _MOMAPY_AVAILABLE = False
+        else:
+            _MOMAPY_IO = momapy.io
+            UOI_TYPES = (momapy.sbgn.pd.UnitOfInformation,)
+            _MOMAPY_AVAILABLE = True
+    return _MOMAPY_IO, _MOMAPY_AVAILABLE
+
+
+def _read_sbgn_file(path: Path, kwargs: Dict[str, Any]) -> Tuple[Path, List[tuple], List[tuple]]:
+    """Worker for MoMaPySBGNAdapter.from_directory: read one file into node and edge lists."""
+    adapter = MoMaPySBGNAdapter(path, **kwargs)
+    return path, adapter.get_nodes_bulk(), adapter.get_edges_bulk()
+
+
+def _iter_sbgn_files(
+    paths: List[Path], workers: Optional[int], kwargs: Dict[str, Any]
+) -> Iterator[Tuple[Path, List[tuple], List[tuple]]]:
+    """Read paths in worker processes, yielding results as they complete."""
+    if not paths:
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_read_sbgn_file, path, kwargs) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert a coordinate to float, passing None through."""
+    return float(value) if value is not None else None
+
 
 class MoMaPySBGNAdapter:
     """
@@ -55,17 +151,26 @@ class MoMaPySBGNAdapter:
         "process": ("process", "SBO_0000375", None),  # SBO_0000375: process
     }
 
+    # Per-class attribute getters for entity pools, built on first sight of each class
+    _ATTR_EXTRACTORS: Dict[type, Callable[[Any], Tuple[Any, ...]]] = {}
+    # Geometry getters: one C-level call per bounding box / point
+    _BBOX_GET = operator.attrgetter("x", "y", "w", "h")
+    _POINT_GET = operator.attrgetter("x", "y")
+
     def __init__(self, data_source: str | Path, add_default_compartments: bool = True, schema_manager = None, 
-                 generate_embeddings: bool = False, **kwargs):
+                 generate_embeddings: bool = False, force_alternative: bool = False, **kwargs):
         """
         Initialize the SBGN adapter.
 
         Args:
             data_source: Path to the SBGN XML file
             add_default_compartments: Whether to add default compartments
-            schema_manager: Optional schema manager for dynamic schema updates
+            schema_manager: Optional schema manager; every node and edge type
+                of the class tables is added to it on construction
             generate_embeddings: Whether to generate embeddings for nodes and edges
             embedding_model: Name of the sentence-transformers model to use
+            force_alternative: Stream the SBGN-ML file with lxml instead of
+                building the momapy model; implied when momapy is not installed
             **kwargs: Additional configuration parameters
         """
         self.data_source = Path(data_source)
@@ -74,34 +179,64 @@ class MoMaPySBGNAdapter:
             raise FileNotFoundError(f"SBGN file not found: {self.data_source}")
         
         self.config = kwargs
-        self.sbgn_map, self.annotations = self._load_sbgn_map()
-
         self.add_default_compartments = add_default_compartments
         self.schema_manager = schema_manager
         self.generate_embeddings = generate_embeddings
+        self.force_alternative = force_alternative or not _import_momapy()[1]
         
         
-        hash = random.getrandbits(64)
-        self.hash_str = "%016x" % hash
+        self.hash_str = secrets.token_hex(8)
         # Initialize embedding model if needed
 
-        self.nodes = {}
-        self.edges = {}
-
-        self.read_nodes()
-        self.read_edges()
+        # Nodes and edges are streamed from get_nodes/get_edges; only the parsed
+        # momapy model is kept (the lxml path re-reads the file on each pass)
+        if self.force_alternative:
+            self.sbgn_map, self.annotations = None, {}
+        else:
+            self.sbgn_map, self.annotations = self._load_sbgn_map()
+        # (id, kind) pairs of the model's nodes, filled by the first read_edges
+        self._node_kinds: Optional[List[Tuple[str, str]]] = None
+        if self.schema_manager:
+            self._register_schema_labels()
         
         if self.generate_embeddings:
             self._generate_embeddings()
 
         logger.info(f"Initialized SBGNAdapter with data source: {self.data_source}")
 
+    @classmethod
+    def from_directory(
+        cls, directory: str | Path, workers: Optional[int] = None, pattern: str = "*.sbgn", **kwargs
+    ) -> Iterator[Tuple[Path, List[tuple], List[tuple]]]:
+        """
+        Read every SBGN file of a directory in parallel worker processes.
+
+        Args:
+            directory: Directory containing the SBGN files
+            workers: Number of worker processes (defaults to the CPU count)
+            pattern: Glob pattern selecting the files to read
+            **kwargs: Adapter options passed to every instance; a schema_manager
+                cannot be shared across processes and is rejected
+
+        Returns:
+            Iterator of (path, nodes, edges) per file, in completion order
+
+        Raises:
+            ValueError: If a schema_manager is passed
+        """
+        if kwargs.get("schema_manager") is not None:
+            raise ValueError("schema_manager cannot be shared across worker processes")
+
+        paths = sorted(Path(directory).glob(pattern))
+        return _iter_sbgn_files(paths, workers, kwargs)
+
     def _load_sbgn_map(self) -> Any:
         """Load and parse the SBGN file using momapy or fallback XML parser."""
 
         logger.info(f"Loading SBGN file: {self.data_source}")
         
-        result = momapy.io.read(self.data_source, return_type="model")
+        reader, _ = _import_momapy()
+        result = reader.read(self.data_source, return_type="model")
         if not hasattr(result, "obj") or result.obj is None:
             raise ValueError(f"Failed to parse SBGN file: {self.data_source}")
 
@@ -109,69 +244,161 @@ class MoMaPySBGNAdapter:
 
         return result.obj, result.annotations
 
+    def _iter_sbgn_elements(self) -> Iterator[Any]:
+        """
+        Stream the top-level glyph and arc elements of the SBGN-ML file.
+
+        Each element is cleared, together with the siblings already consumed,
+        once the caller moves on, so memory stays flat regardless of map size.
+        Nested glyphs (units of information, state variables) are left attached
+        to their parent glyph.
+        """
+        context = etree.iterparse(
+            str(self.data_source), events=("end",), tag=("{*}glyph", "{*}arc"), **ITERPARSE_OPTIONS
+        )
+        for _, elem in context:
+            parent = elem.getparent()
+            if etree.QName(parent).localname != "map":
+                continue
+            yield elem
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+        del context
+
+    @staticmethod
+    def _get_xml_annotations(elem) -> Dict[str, List[str]]:
+        """Collect the MIRIAM annotations of an SBGN-ML element, keyed like momapy qualifiers."""
+        annotation_dict = {}
+        for qualifier in elem.iterfind(
+            f"{{*}}extension/{{*}}annotation/{{{RDF_NS}}}RDF/{{{RDF_NS}}}Description/*"
+        ):
+            qname = etree.QName(qualifier)
+            prefix = BQ_NAMESPACES.get(qname.namespace)
+            if prefix is None:
+                continue
+            _key = f"{prefix}.{re.sub('(?<!^)(?=[A-Z])', '_', qname.localname).upper()}"
+            for resource in qualifier.iterfind(f"{{{RDF_NS}}}Bag/{{{RDF_NS}}}li"):
+                annotation_dict.setdefault(_key, []).append(resource.get(f"{{{RDF_NS}}}resource"))
+        return annotation_dict
+
     def _get_glyph_class(self, glyph) -> str:
         """Extract class from a glyph, handling different attribute names."""
-        if hasattr(glyph, "class_"):
+        try:
             return glyph.class_
-        elif hasattr(glyph, "class"):
+        except AttributeError:
+            pass
+        try:
             return getattr(glyph, "class")
-        elif hasattr(glyph, "glyph_class"):
+        except AttributeError:
+            pass
+        try:
             return glyph.glyph_class
-        else:
-            return glyph.__class__.__name__
+        except AttributeError:
+            return type(glyph).__name__
 
-    def extract_glyph_schema_labels(self, label):
-        node_type, sbo_term, parent_glyph = self.GLYPH_CLASS_TO_NODE_TYPE.get(
-            label.lower(), self.GLYPH_CLASS_TO_NODE_TYPE["physical entity"])
-        
-        child_type = node_type        
+    @classmethod
+    def _resolve_glyph(cls, label):
+        """Resolve a lowercased glyph class to (node_type, sbo_term, schema pairs).
+
+        The schema pairs are the (parent, child) entries linking the node type to
+        its ancestors, ordered from the root down. Only used to build
+        _GLYPH_RESOLVED at import.
+        """
+        node_type, sbo_term, parent_glyph = cls._GLYPH_LC[label]
+
+        child_type = node_type
         schema_entries = []
-        while parent_glyph != None and self.schema_manager:
+        while parent_glyph is not None:
             schema_entries.insert(0, (parent_glyph, child_type))
-            child_type, _, parent_glyph = self.GLYPH_CLASS_TO_NODE_TYPE.get(
-                parent_glyph.lower(), (None, None, None))
-            
-        for parent_glyph, child_type in schema_entries:            
+            child_type, _, parent_glyph = cls._GLYPH_LC.get(
+                parent_glyph, (None, None, None))
+        return node_type, sbo_term, tuple(schema_entries)
+
+    @classmethod
+    def _resolve_edge(cls, label):
+        """Resolve a lowercased arc class to (edge_type, sbo_term, schema pairs).
+
+        The schema pairs are ordered from the edge type up to the root. Only used
+        to build _ARC_RESOLVED at import.
+        """
+        edge_type, sbo_term, parent_glyph = cls._ARC_LC[label]
+
+        child_type = edge_type
+        schema_entries = []
+        while parent_glyph is not None:
+            schema_entries.append((parent_glyph, child_type))
+            child_type, _, parent_glyph = cls._ARC_LC.get(
+                parent_glyph, (None, None, None))
+        return edge_type, sbo_term, tuple(schema_entries)
+
+    def _register_schema_labels(self) -> None:
+        """Add the node and edge types of the class tables to the schema manager, parents first.
+
+        A type listed as its own parent (modulation -> modifier) is not re-added.
+        """
+        chains = [entries for _, _, entries in self._GLYPH_RESOLVED.values()]
+        # Arc chains run from the edge type up to the root
+        chains += [entries[::-1] for _, _, entries in self._ARC_RESOLVED.values()]
+        schema_entries = dict.fromkeys(
+            (parent, child) for chain in chains for parent, child in chain if parent != child
+        )
+        for parent_glyph, child_type in schema_entries:
             self.schema_manager.add_child(parent_glyph, child_type)
+
+    def extract_glyph_schema_labels(self, label):
+        """Map a lowercased glyph class to (node_type, sbo_term)."""
+        node_type, sbo_term, _ = self._GLYPH_RESOLVED.get(label, self._GLYPH_DEFAULT)
         return node_type, sbo_term
-            
+
     def extract_edge_schema_labels(self, label):
-        edge_type, sbo_term, parent_glyph = self.ARC_CLASS_TO_EDGE_TYPE.get(
-            label.lower(), self.ARC_CLASS_TO_EDGE_TYPE["process"])
-        
-        child_type = edge_type
-        while parent_glyph != None and self.schema_manager:
-            self.schema_manager.add_child(parent_glyph, child_type)
-            child_type, _, parent_glyph = self.ARC_CLASS_TO_EDGE_TYPE.get(
-                parent_glyph.lower(), (None, None, None))
-            
+        """Map a lowercased arc class to (edge_type, sbo_term)."""
+        edge_type, sbo_term, _ = self._ARC_RESOLVED.get(label, self._ARC_DEFAULT)
         return edge_type, sbo_term
-    
+
     def get_annotations(self, model_obj) -> Dict[str, Any]:
-        annotations = self.annotations.get(model_obj, [])
-        annotation_dict = {}
-        for annotation in annotations:
-            _key = str(annotation.qualifier)
-            for resource in annotation.resources:
-                if _key not in annotation_dict:
-                    annotation_dict[_key] = []
-                annotation_dict[_key].append(str(resource))
-            
-        return annotation_dict
+        annotation_dict = defaultdict(list)
+        for annotation in self.annotations.get(model_obj, ()):
+            resources = annotation.resources
+            if not resources:
+                continue
+            append = annotation_dict[str(annotation.qualifier)].append
+            for resource in resources:
+                append(str(resource))
+
+        return dict(annotation_dict)
     
+    @classmethod
+    def _get_glyph_extractor(cls, glyph) -> Callable[[Any], Tuple[Any, ...]]:
+        """
+        Return a getter yielding the GLYPH_FIELD_DEFAULTS attributes of a glyph as a tuple.
+
+        Classes carrying every attribute get a plain operator.attrgetter; the
+        others fall back to getattr with the per-field defaults.
+        """
+        glyph_type = type(glyph)
+        extractor = cls._ATTR_EXTRACTORS.get(glyph_type)
+        if extractor is None:
+            names = [name for name, _ in GLYPH_FIELD_DEFAULTS]
+            if all(name in dir(glyph) for name in names):
+                extractor = operator.attrgetter(*names)
+            else:
+                def extractor(obj):
+                    return tuple(getattr(obj, name, default) for name, default in GLYPH_FIELD_DEFAULTS)
+            cls._ATTR_EXTRACTORS[glyph_type] = extractor
+        return extractor
+
     def get_unit_of_information(self, glyph) -> List[str]:
         # Extract unit of information if present (for nucleic acid features)
-        additional_info = getattr(glyph, "units_of_information", [])
-        units_of_info = []
-        for info in additional_info:
-            prefix = getattr(info, "prefix", None) 
-            _value =getattr(info, "value", None)
-            if prefix and _value: 
-                units_of_info.append(f"{prefix}:{_value}")
-            elif _value:
-                units_of_info.append(_value)
-
-        return units_of_info
+        return self._format_units_of_information(getattr(glyph, "units_of_information", []))
+
+    @staticmethod
+    def _format_units_of_information(additional_info) -> List[str]:
+        return [
+            f"{info.prefix}:{info.value}" if info.prefix else info.value
+            for info in additional_info
+            if isinstance(info, UOI_TYPES) and info.value
+        ]
 
     def read_nodes(self):
         """
@@ -189,31 +416,25 @@ class MoMaPySBGNAdapter:
         if isinstance(self.sbgn_map, dict):
             glyphs = self.sbgn_map.get("glyphs", [])
         else:
-            if hasattr(self.sbgn_map, "entity_pools"):
-                glyphs = self.sbgn_map.entity_pools
-            if hasattr(self.sbgn_map, "processes"):
-                processes = self.sbgn_map.processes  
-            if hasattr(self.sbgn_map, "compartments"):
-                compartments = self.sbgn_map.compartments
-        
+            glyphs = getattr(self.sbgn_map, "entity_pools", glyphs)
+            processes = getattr(self.sbgn_map, "processes", processes)
+            compartments = getattr(self.sbgn_map, "compartments", compartments)
 
         node_count = 0
 
-        self.nodes["model"] = ("model", "model", {"source": self.data_source, "sbo_term": "SBO_0000231"}, "model")  # SBO_0000411: model
+        yield ("model", "model", {"source": self.data_source, "sbo_term": "SBO_0000231"}, "model")  # SBO_0000411: model
 
         for compartment in compartments:
-            self.nodes[compartment] = (compartment.id_, "compartment", {"name": compartment.label}, "compartment")
+            yield (compartment.id_, "compartment", {"name": compartment.label}, "compartment")
 
         if self.add_default_compartments:
-            self.nodes["default_compartment"] = ("default_compartment", "compartment", {"name": "default"}, "compartment")
+            yield ("default_compartment", "compartment", {"name": "default"}, "compartment")
 
         for glyph in glyphs:            
             # momapy object structure
             # Skip nested glyphs (e.g., unit of information inside nucleic acid feature)
             # Only process top-level glyphs
-            glyph_id = None
-            if hasattr(glyph, "id_"):
-                glyph_id = glyph.id_
+            glyph_id, label_text, bbox, orientation, additional_info = self._get_glyph_extractor(glyph)(glyph)
 
             if not glyph_id:
                 continue
@@ -224,54 +445,38 @@ class MoMaPySBGNAdapter:
             # Map to BioCypher node type
             node_type, sbo_term = self.extract_glyph_schema_labels(glyph_class.lower())
 
-            # Extract label
-            label_text = getattr(glyph, "label", "")
-
-            # Build properties
-            properties: Dict[str, Any] = {}
-
-            properties.update(self.get_annotations(glyph_id))
-
-            units_of_info = self.get_unit_of_information(glyph)
-            if units_of_info:  
-                properties["unit_of_information"] = units_of_info
-
-            if sbo_term:
-                properties["sbo_term"] = sbo_term
-
-            if label_text:
-                properties["name"] = label_text
-                properties["label"] = label_text
-
-            # Extract bounding box information if available
-            if hasattr(glyph, "bbox"):
-                bbox = glyph.bbox
-                if hasattr(bbox, "x"):
-                    properties["x"] = float(bbox.x) if bbox.x is not None else None
-                if hasattr(bbox, "y"):
-                    properties["y"] = float(bbox.y) if bbox.y is not None else None
-                if hasattr(bbox, "w"):
-                    properties["width"] = float(bbox.w) if bbox.w is not None else None
-                if hasattr(bbox, "h"):
-                    properties["height"] = float(bbox.h) if bbox.h is not None else None
-
-            # Extract orientation if available
-            if hasattr(glyph, "orientation"):
-                properties["orientation"] = glyph.orientation
-
-
-
-            self.nodes[glyph] = (glyph_id, node_type, properties, "entity")
+            try:
+                x, y, w, h = self._BBOX_GET(bbox)
+            except AttributeError:
+                x, y, w, h = (getattr(bbox, name, None) for name in ("x", "y", "w", "h"))
+
+            # Build properties in one pass, leaving out missing values
+            properties: Dict[str, Any] = self.get_annotations(glyph_id)
+            properties.update({k: v for k, v in (
+                ("unit_of_information", self._format_units_of_information(additional_info) or None),
+                ("sbo_term", sbo_term or None),
+                ("name", label_text or None),
+                ("label", label_text or None),
+                ("x", _to_float(x)),
+                ("y", _to_float(y)),
+                ("width", _to_float(w)),
+                ("height", _to_float(h)),
+                ("orientation", None if orientation is _MISSING else orientation),
+            ) if v is not None})
+
+            yield (glyph_id, node_type, properties, "entity")
             node_count += 1
 
         for process in processes:
             node_type, sbo_term = self.extract_glyph_schema_labels("process")
-            if hasattr(process, "id_"):
-                properties = {"sbo_term": sbo_term}
-                properties.update(self.get_annotations(process))
-                self.nodes[process] = (process.id_, node_type, properties, "process")
-                node_count += 1
-
+            try:
+                process_id = process.id_
+            except AttributeError:
+                continue
+            properties = {"sbo_term": sbo_term}
+            properties.update(self.get_annotations(process))
+            yield (process_id, node_type, properties, "process")
+            node_count += 1
 
         logger.info(f"Extracted {node_count} nodes from SBGN file")
 
@@ -289,57 +494,61 @@ class MoMaPySBGNAdapter:
         edge_count = 0
 
         # Access arcs from the map (momapy structure)
-        modulations = []
-        processes = []
-        glyphs = []
-        if hasattr(self.sbgn_map, "modulations"):
-            modulations = self.sbgn_map.modulations
-        if hasattr(self.sbgn_map, "processes"):
-            processes = self.sbgn_map.processes
-        if hasattr(self.sbgn_map, "entity_pools"):
-            glyphs = self.sbgn_map.entity_pools
-
-        for k, node in self.nodes.items():
-            if k != "model":
-                self.edges[f"{node[0]}_in_model"] = (f"{node[0]}_in_model", node[0], "model", f"is {node[3]} of", {})
+        modulations = getattr(self.sbgn_map, "modulations", [])
+        processes = getattr(self.sbgn_map, "processes", [])
+        glyphs = getattr(self.sbgn_map, "entity_pools", [])
+
+        if self._node_kinds is None:
+            self._node_kinds = [(node[0], node[3]) for node in self.read_nodes()]
+        for node_id, kind in self._node_kinds:
+            if kind != "model":
+                yield (f"{node_id}_in_model", node_id, "model", f"is {kind} of", {})
                 edge_count += 1
 
         for glyph in glyphs:
-            comp = getattr(glyph, "compartment", None)
-            glyph_id = getattr(glyph, "id_", None)
+            try:
+                glyph_id, comp = glyph.id_, glyph.compartment
+            except AttributeError:
+                glyph_id = getattr(glyph, "id_", None)
+                comp = getattr(glyph, "compartment", None)
             if comp:
-                comp_id = getattr(comp, "id_", None)
+                try:
+                    comp_id = comp.id_
+                except AttributeError:
+                    comp_id = None
                 edge_id = f"{glyph_id}_in_compartment_{comp_id}"
             elif self.add_default_compartments:
                 comp_id = "default_compartment"
                 edge_id = f"{glyph_id}_in_default_compartment"
             else:
                 continue
-            edge_type, sbo_term = "contained entity", "SBO_0000664"
-            properties: Dict[str, Any] = {}
-            if sbo_term:
-                properties["sbo_term"] = sbo_term
+            properties: Dict[str, Any] = CONTAINED_ENTITY_PROPERTIES.copy()
             properties.update(self.get_annotations(glyph))
-            self.edges[glyph] = (edge_id, glyph_id, comp_id, edge_type, properties)
+            yield (edge_id, glyph_id, comp_id, "contained entity", properties)
             edge_count += 1
 
         for modulation in modulations:
 
-            edge_id = getattr(modulation, "id_", None)
+            try:
+                edge_id = modulation.id_
+            except AttributeError:
+                edge_id = None
 
-            arc_class = modulation.__class__.__name__ if hasattr(modulation, "__class__") else "unknown"
+            arc_class = type(modulation).__name__
 
             # Map to BioCypher edge type
             edge_type, sbo_term = self.extract_edge_schema_labels(arc_class.lower())
 
             # Resolve endpoints
-            source_id = None
-            target_id = None
-            if hasattr(modulation, "source"):
-                source_id = getattr(modulation.source, "id_", None)
-            if hasattr(modulation, "target"):
-                target_id = getattr(modulation.target, "id_", None)
-            
+            try:
+                source_id = modulation.source.id_
+            except AttributeError:
+                source_id = None
+            try:
+                target_id = modulation.target.id_
+            except AttributeError:
+                target_id = None
+
             if not source_id or not target_id:
                 logger.warning(f"Could not resolve endpoints for modulation {edge_id}")
                 continue
@@ -347,8 +556,8 @@ class MoMaPySBGNAdapter:
             properties: Dict[str, Any] = {}
             # momapy object structure
             # Extract arc ID if available
-            if hasattr(modulation, "id_"):
-                properties["sbgn_arc_id"] = modulation.id_
+            if edge_id is not None:
+                properties["sbgn_arc_id"] = edge_id
 
             if sbo_term:
                 properties["sbo_term"] = sbo_term
@@ -356,59 +565,69 @@ class MoMaPySBGNAdapter:
             properties.update(self.get_annotations(modulation))
 
             # Extract start/end coordinates if available
-            if hasattr(modulation, "start"):
+            try:
                 start = modulation.start
-                if hasattr(start, "x") and hasattr(start, "y"):
-                    properties["start_x"] = float(start.x) if start.x is not None else None
-                    properties["start_y"] = float(start.y) if start.y is not None else None
+                start_x, start_y = start.x, start.y
+            except AttributeError:
+                pass
+            else:
+                properties["start_x"] = _to_float(start_x)
+                properties["start_y"] = _to_float(start_y)
 
-            if hasattr(modulation, "end"):
+            try:
                 end = modulation.end
-                if hasattr(end, "x") and hasattr(end, "y"):
-                    properties["end_x"] = float(end.x) if end.x is not None else None
-                    properties["end_y"] = float(end.y) if end.y is not None else None
+                end_x, end_y = end.x, end.y
+            except AttributeError:
+                pass
+            else:
+                properties["end_x"] = _to_float(end_x)
+                properties["end_y"] = _to_float(end_y)
 
             # Extract intermediate points if available
-            if hasattr(modulation, "next") or hasattr(modulation, "points"):
+            # Collect intermediate points, either as a "next" chain or a points list
+            try:
+                point = modulation.next
+            except AttributeError:
+                points = getattr(modulation, "points", ())
+            else:
                 points = []
-                if hasattr(modulation, "next"):
-                    # Handle next points
-                    next_point = modulation.next
-                    while next_point:
-                        if hasattr(next_point, "x") and hasattr(next_point, "y"):
-                            points.append(
-                                {
-                                    "x": float(next_point.x) if next_point.x is not None else None,
-                                    "y": float(next_point.y) if next_point.y is not None else None,
-                                }
-                            )
-                        next_point = getattr(next_point, "next", None)
-                elif hasattr(modulation, "points"):
-                    for point in modulation.points:
-                        if hasattr(point, "x") and hasattr(point, "y"):
-                            points.append(
-                                {
-                                    "x": float(point.x) if point.x is not None else None,
-                                    "y": float(point.y) if point.y is not None else None,
-                                }
-                            )
-                if points:
-                    # Convert list of dicts to string representation for BioCypher
-                    points_str = "|".join([f"{p.get('x',0)},{p.get('y',0)}" for p in points])
-                    properties["intermediate_points"] = points_str
-
-            self.edges[modulation] = (edge_id, source_id, target_id, edge_type, properties)
+                while point:
+                    points.append(point)
+                    point = getattr(point, "next", None)
+
+            # Coordinates go straight into double buffers; missing ones are NaN
+            xs, ys = array("d"), array("d")
+            for point in points:
+                try:
+                    x, y = self._POINT_GET(point)
+                except AttributeError:
+                    continue
+                xs.append(float(x) if x is not None else nan)
+                ys.append(float(y) if y is not None else nan)
+            if xs:
+                # Convert the coordinates to string representation for BioCypher
+                properties["intermediate_points"] = "|".join(map("{},{}".format, xs, ys))
+
+            yield (edge_id, source_id, target_id, edge_type, properties)
             edge_count += 1
 
         for process in processes:
             
-            glyph_id = getattr(process, "id_", None)
+            try:
+                glyph_id = process.id_
+            except AttributeError:
+                glyph_id = None
 
             for reactant in getattr(process, "reactants", []):
-                edge_id = getattr(reactant, "id_", None)
+                try:
+                    edge_id = reactant.id_
+                except AttributeError:
+                    edge_id = None
                 target_id = glyph_id
-                source_glyph = getattr(reactant, "element", None)
-                source_id = getattr(source_glyph, "id_", None) if source_glyph else None
+                try:
+                    source_id = reactant.element.id_
+                except AttributeError:
+                    source_id = None
                 if not source_id or not target_id:
                     logger.warning(
                         f"Could not resolve endpoints for reactant in process {edge_id}"
@@ -416,7 +635,7 @@ class MoMaPySBGNAdapter:
                     continue
 
                 arc_class = "reactant"
-                edge_type, sbo_term = self.extract_edge_schema_labels(arc_class.lower())
+                edge_type, sbo_term = self.extract_edge_schema_labels(arc_class)
 
                 properties: Dict[str, Any] = {
                     "sbgn_arc_class": arc_class,
@@ -426,14 +645,19 @@ class MoMaPySBGNAdapter:
 
                 properties.update(self.get_annotations(reactant))
 
-                self.edges[reactant] = (edge_id, source_id, target_id, edge_type, properties)
+                yield (edge_id, source_id, target_id, edge_type, properties)
                 edge_count += 1
 
             for product in getattr(process, "products", []):
                 source_id = glyph_id
-                target_glyph = getattr(product, "element", None)
-                target_id = getattr(target_glyph, "id_", None) if target_glyph else None
-                edge_id = getattr(product, "id_", None)
+                try:
+                    target_id = product.element.id_
+                except AttributeError:
+                    target_id = None
+                try:
+                    edge_id = product.id_
+                except AttributeError:
+                    edge_id = None
                 if not source_id or not target_id:
                     logger.warning(
                         f"Could not resolve endpoints for product in process {edge_id}"
@@ -441,7 +665,7 @@ class MoMaPySBGNAdapter:
                     continue
 
                 arc_class = "product"
-                edge_type, sbo_term = self.extract_edge_schema_labels(arc_class.lower())
+                edge_type, sbo_term = self.extract_edge_schema_labels(arc_class)
 
                 properties: Dict[str, Any] = {
                     "sbgn_arc_class": arc_class,
@@ -451,20 +675,238 @@ class MoMaPySBGNAdapter:
 
                 properties.update(self.get_annotations(product))
 
-                self.edges[product] = (edge_id, source_id, target_id, edge_type, properties)
+                yield (edge_id, source_id, target_id, edge_type, properties)
                 edge_count += 1
 
         logger.info(f"Extracted {edge_count} edges from SBGN file")
 
+    def read_sbgn_xml(self) -> Iterator[Tuple[str, tuple]]:
+        """
+        Extract nodes and edges in a single streaming pass over the SBGN-ML file.
+
+        This is the alternative to read_nodes/read_edges used when force_alternative
+        is set: glyph and arc ids are taken verbatim from the file and layout
+        information (bounding boxes, arc points) is kept on the properties.
+
+        Yields:
+            ("node", node_tuple) and ("edge", edge_tuple) pairs in document order
+        """
+        logger.info("Extracting nodes and edges from SBGN-ML file")
+
+        def _with_model_edge(node):
+            return (
+                ("node", node),
+                ("edge", (f"{node[0]}_in_model", node[0], "model", f"is {node[3]} of", {})),
+            )
+
+        yield "node", ("model", "model", {"source": self.data_source, "sbo_term": "SBO_0000231"}, "model")  # SBO_0000411: model
+        if self.add_default_compartments:
+            yield from _with_model_edge(("default_compartment", "compartment", {"name": "default"}, "compartment"))
+
+        port_owner: Dict[str, str] = {}
+        node_count = 0
+        edge_count = 0
+
+        for elem in self._iter_sbgn_elements():
+            elem_id = elem.get("id")
+            elem_class = elem.get("class", "")
+            if not elem_id:
+                continue
+
+            if etree.QName(elem).localname == "glyph":
+                for port in elem.iterfind("{*}port"):
+                    port_owner[port.get("id")] = elem_id
+                if elem_class in SBGN_SKIPPED_CLASSES:
+                    continue
+
+                label = elem.find("{*}label")
+                label_text = label.get("text", "") if label is not None else ""
+
+                if elem_class == "compartment":
+                    yield from _with_model_edge((elem_id, "compartment", {"name": label_text or None}, "compartment"))
+                    node_count += 1
+                    continue
+
+                if elem_class in SBGN_PROCESS_CLASSES:
+                    node_type, sbo_term = self.extract_glyph_schema_labels("process")
+                    properties = {"sbo_term": sbo_term}
+                    properties.update(self._get_xml_annotations(elem))
+                    yield from _with_model_edge((elem_id, node_type, properties, "process"))
+                    node_count += 1
+                    continue
+
+                node_type, sbo_term = self.extract_glyph_schema_labels(elem_class)
+
+                units_of_info = [
+                    sub_label.get("text")
+                    for sub_label in elem.iterfind("{*}glyph[@class='unit of information']/{*}label")
+                    if sub_label.get("text")
+                ]
+                bbox = elem.find("{*}bbox")
+                bbox = bbox.attrib if bbox is not None else {}
+                properties: Dict[str, Any] = {k: v for k, v in (
+                    ("unit_of_information", units_of_info or None),
+                    ("sbo_term", sbo_term or None),
+                    ("name", label_text or None),
+                    ("label", label_text or None),
+                    ("x", _to_float(bbox.get("x"))),
+                    ("y", _to_float(bbox.get("y"))),
+                    ("width", _to_float(bbox.get("w"))),
+                    ("height", _to_float(bbox.get("h"))),
+                    ("orientation", elem.get("orientation") or None),
+                ) if v is not None}
+
+                yield from _with_model_edge((elem_id, node_type, properties, "entity"))
+                node_count += 1
+
+                comp_id = elem.get("compartmentRef")
+                if comp_id:
+                    edge_id = f"{elem_id}_in_compartment_{comp_id}"
+                elif self.add_default_compartments:
+                    comp_id = "default_compartment"
+                    edge_id = f"{elem_id}_in_default_compartment"
+                else:
+                    continue
+                properties = CONTAINED_ENTITY_PROPERTIES.copy()
+                properties.update(self._get_xml_annotations(elem))
+                yield "edge", (edge_id, elem_id, comp_id, "contained entity", properties)
+                edge_count += 1
+                continue
+
+            # arcs: glyphs always precede arcs in SBGN-ML, so every port is known here
+            source_id = port_owner.get(elem.get("source"), elem.get("source"))
+            target_id = port_owner.get(elem.get("target"), elem.get("target"))
+            if not source_id or not target_id:
+                logger.warning(f"Could not resolve endpoints for arc {elem_id}")
+                continue
+
+            if elem_class in ("consumption", "production"):
+                arc_class = "reactant" if elem_class == "consumption" else "product"
+                edge_type, sbo_term = self.extract_edge_schema_labels(arc_class)
+                properties = {"sbgn_arc_class": arc_class}
+                if sbo_term:
+                    properties["sbo_term"] = sbo_term
+                properties.update(self._get_xml_annotations(elem))
+                yield "edge", (elem_id, source_id, target_id, edge_type, properties)
+                edge_count += 1
+                continue
+
+            if elem_class not in SBGN_MODULATION_CLASSES:
+                continue
+
+            edge_type, sbo_term = self.extract_edge_schema_labels(elem_class)
+            properties = {"sbgn_arc_id": elem_id}
+            if sbo_term:
+                properties["sbo_term"] = sbo_term
+            properties.update(self._get_xml_annotations(elem))
+
+            start = elem.find("{*}start")
+            if start is not None:
+                properties["start_x"] = _to_float(start.get("x"))
+                properties["start_y"] = _to_float(start.get("y"))
+            end = elem.find("{*}end")
+            if end is not None:
+                properties["end_x"] = _to_float(end.get("x"))
+                properties["end_y"] = _to_float(end.get("y"))
+            # Coordinates are kept as written in the file, no float round-trip
+            points_str = "|".join([f"{p.get('x')},{p.get('y')}" for p in elem.iterfind("{*}next")])
+            if points_str:
+                properties["intermediate_points"] = points_str
+
+            yield "edge", (elem_id, source_id, target_id, edge_type, properties)
+            edge_count += 1
+
+        logger.info(f"Extracted {node_count} nodes and {edge_count} edges from SBGN-ML file")
+
+    def get_geometry(self) -> Dict[str, np.ndarray]:
+        """
+        Collect node and arc layout into float32 columns and derive simple statistics.
+
+        Missing values are NaN. Layout is only present when the file is read with
+        force_alternative, the momapy model carries no coordinates.
+
+        Returns:
+            Dictionary with the x, y, width, height and area columns of the nodes
+            and the start_x, start_y, end_x, end_y and length columns of the arcs
+        """
+        node_keys = ("x", "y", "width", "height")
+        edge_keys = ("start_x", "start_y", "end_x", "end_y")
+        nodes = [node[2] for node in self.get_nodes()]
+        edges = [edge[4] for edge in self.get_edges()]
+
+        # One conversion per table: numpy turns the missing (None) values into NaN
+        node_coords = np.array(
+            [[props.get(key) for key in node_keys] for props in nodes], dtype=np.float32
+        ).reshape(-1, len(node_keys))
+        edge_coords = np.array(
+            [[props.get(key) for key in edge_keys] for props in edges], dtype=np.float32
+        ).reshape(-1, len(edge_keys))
+
+        geometry = dict(zip(node_keys, node_coords.T))
+        geometry.update(zip(edge_keys, edge_coords.T))
+        geometry["area"] = geometry["width"] * geometry["height"]
+        geometry["length"] = np.hypot(
+            geometry["end_x"] - geometry["start_x"], geometry["end_y"] - geometry["start_y"]
+        )
+        return geometry
+
+    def _read_nodes_raw(self) -> Iterator[Tuple[str, str, Dict[str, Any], str]]:
+        """Unprefixed node tuples from whichever reader is active."""
+        if self.force_alternative:
+            return (item for kind, item in self.read_sbgn_xml() if kind == "node")
+        return self.read_nodes()
+
+    def _read_edges_raw(self) -> Iterator[Tuple[str, str, str, str, Dict[str, Any]]]:
+        """Unprefixed edge tuples from whichever reader is active."""
+        if self.force_alternative:
+            return (item for kind, item in self.read_sbgn_xml() if kind == "edge")
+        return self.read_edges()
+
     def get_nodes(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
-        """Return stored nodes."""
-        for node in self.nodes.values():
-            node_id, node_type, properties, _ = node
-            yield (f"{self.hash_str}_{node_id}", node_type, properties)
+        """Stream nodes, prefixed with the adapter hash."""
+        prefix = self.hash_str + "_"
+        for node_id, node_type, properties, _ in self._read_nodes_raw():
+            yield (prefix + node_id, node_type, properties)
     
     def get_edges(self) -> Iterator[Tuple[str, str, str, str, Dict[str, Any]]]:
-        """Return stored edges."""
-        for edge in self.edges.values():
-            edge_id, source_id, target_id, edge_type, properties = edge
-            yield (f"{self.hash_str}_{edge_id}", f"{self.hash_str}_{source_id}", f"{self.hash_str}_{target_id}", edge_type, properties)
-    
\ No newline at end of file
+        """Stream edges, prefixed with the adapter hash."""
+        prefix = self.hash_str + "_"
+        for edge_id, source_id, target_id, edge_type, properties in self._read_edges_raw():
+            yield (prefix + edge_id, prefix + source_id, prefix + target_id, edge_type, properties)
+
+    def get_nodes_bulk(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Return all nodes as one list, for consumers writing in bulk.
+
+        Same tuples as get_nodes, built in a single comprehension; the list is
+        new on every call and owned by the caller.
+        """
+        prefix = self.hash_str + "_"
+        return [(prefix + node_id, node_type, properties) for node_id, node_type, properties, _ in self._read_nodes_raw()]
+
+    def get_edges_bulk(self) -> List[Tuple[str, str, str, str, Dict[str, Any]]]:
+        """Return all edges as one list; see get_nodes_bulk."""
+        prefix = self.hash_str + "_"
+        return [
+            (prefix + edge_id, prefix + source_id, prefix + target_id, edge_type, properties)
+            for edge_id, source_id, target_id, edge_type, properties in self._read_edges_raw()
+        ]
+
+
+def _intern_class_table(table):
+    """Lowercase the keys of a class table and intern every string, so each type and SBO term exists once."""
+    return {
+        sys.intern(k.lower()): tuple(sys.intern(v) if v is not None else None for v in values)
+        for k, values in table.items()
+    }
+
+
+# Lowercased lookup tables; parent classes in the values are lowercase already
+MoMaPySBGNAdapter._GLYPH_LC = _intern_class_table(MoMaPySBGNAdapter.GLYPH_CLASS_TO_NODE_TYPE)
+MoMaPySBGNAdapter._ARC_LC = _intern_class_table(MoMaPySBGNAdapter.ARC_CLASS_TO_EDGE_TYPE)
+# Lowercased class -> (type, sbo_term, schema pairs), with the parent chains walked once
+MoMaPySBGNAdapter._GLYPH_RESOLVED = {k: MoMaPySBGNAdapter._resolve_glyph(k) for k in MoMaPySBGNAdapter._GLYPH_LC}
+MoMaPySBGNAdapter._ARC_RESOLVED = {k: MoMaPySBGNAdapter._resolve_edge(k) for k in MoMaPySBGNAdapter._ARC_LC}
+# Entries used for unknown classes
+MoMaPySBGNAdapter._GLYPH_DEFAULT = MoMaPySBGNAdapter._GLYPH_RESOLVED["physical entity"]
+MoMaPySBGNAdapter._ARC_DEFAULT = MoMaPySBGNAdapter._ARC_RESOLVED["process"]
@@ -9,7 +9,16 @@ import logging
 import hashlib
 from pathlib import Path
 from typing import Iterator, Tuple, Dict, Any, Optional
-import xml.etree.ElementTree as ET
+
+try:
+    # libxml2-backed parser; the ElementTree API used below is identical
+    from lxml import etree as ET
+
+    _XML_PARSER = ET.XMLParser(huge_tree=True, remove_blank_text=True, resolve_entities=False)
+except ImportError:  # pragma: no cover - lxml is a declared dependency
+    import xml.etree.ElementTree as ET
+
+    _XML_PARSER = None
 
 logger = logging.getLogger(__name__)
 
@@ -109,7 +118,7 @@ class SBGNAdapter:
     
     def _parse_xml_directly(self) -> Dict[str, Any]:
         """Parse SBGN XML directly using ElementTree as fallback."""
-        tree = ET.parse(self.data_source)
+        tree = ET.parse(str(self.data_source), _XML_PARSER)
         root = tree.getroot()
         
         # SBGN namespace
@@ -635,12 +644,12 @@ class SBGNAdapter:
                 for reactant in getattr(process, "reactants", []):
                     source_id = getattr(reactant, "id_", None)
                     target_id = glyph_id
-                    edge_id = f"{source_id}_reactant_{target_id}"
                     if not source_id or not target_id:
                         logger.warning(
-                            f"Could not resolve endpoints for reactant in process {edge_id}"
+                            f"Could not resolve endpoints for reactant in process {glyph_id}"
                         )
                         continue
+                    edge_id = f"{source_id}_reactant_{target_id}"
 
                     arc_class = "reactant"
                     edge_type = self.ARC_CLASS_TO_EDGE_TYPE.get(arc_class, "interaction")
@@ -655,12 +664,12 @@ class SBGNAdapter:
                 for product in getattr(process, "products", []):
                     source_id = glyph_id
                     target_id = getattr(product, "id_", None)
-                    edge_id = f"{source_id}_product_{target_id}"
                     if not source_id or not target_id:
                         logger.warning(
-                            f"Could not resolve endpoints for product in process {edge_id}"
+                            f"Could not resolve endpoints for product in process {glyph_id}"
                         )
                         continue
+                    edge_id = f"{source_id}_product_{target_id}"
 
                     arc_class = "product"
                     edge_type = self.ARC_CLASS_TO_EDGE_TYPE.get(arc_class, "interaction")
@@ -1,13 +1,21 @@
 import logging
 from pathlib import Path
 from typing import Iterator, Tuple, Dict, Any
-import base64
+from base64 import b64encode
 from collections import defaultdict
 
+from lxml import etree
 from momapy.sbml.io import sbml
 
 logger = logging.getLogger(__name__)
 
+# Parser settings for finding the root element; entities are never expanded
+# and nothing is fetched from the network
+ROOT_PARSE_OPTIONS = dict(
+    resolve_entities=False,
+    no_network=True,
+)
+
 
 class SBMLAdapter:
     """
@@ -41,6 +49,14 @@ class SBMLAdapter:
 
         self.annotations_as_node_properties = annotations_as_node_properties
 
+        self.model = None
+        self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        """Parse the SBML file once, caching the model, annotations and notes."""
+        if self.model is not None:
+            return
+
         logger.info(f"Loading SBML model with momapy: {self.sbml_path}")
 
         result = sbml.SBMLReader.read(self.sbml_path)
@@ -69,48 +85,35 @@ class SBMLAdapter:
 
 
         # --- SBML compartments → compartment nodes ---
-        for comp in self.model.compartments:
-            props = {}
-            node_id = comp.id_
-
-            notes_base64 = self._parse_notes(self.notes.get(comp, None))
-            if notes_base64 is not None:
-                props["notes_base64"] = notes_base64
-            if comp.name is not None:
-                props["name"] = comp.name
-            if self.annotations_as_node_properties:
-                props.update(self._parse_annotations_to_node_properties(self.annotations.get(comp, None)))
-
-            yield (node_id, "compartment", props)
+        yield from self._emit(self.model.compartments, "compartment")
 
         # --- SBML species → entity nodes ---
-        for sp in self.model.species:
-            props = {}
-            node_id = sp.id_
+        yield from self._emit(self.model.species, "entity")
 
-            notes_base64 = self._parse_notes(self.notes.get(sp, None))
-            if notes_base64 is not None:
-                props["notes_base64"] = notes_base64
-            if sp.name is not None:
-                props["name"] = sp.name
-            if self.annotations_as_node_properties:
-                props.update(self._parse_annotations_to_node_properties(self.annotations.get(sp, None)))
+        # --- SBML reactions → process nodes ---
+        yield from self._emit(self.model.reactions, "process")
 
-            yield (node_id, "entity", props)
+    def _emit(self, elements, label: str) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield (id, label, properties) for SBML elements sharing one node label."""
+        notes_get = self.notes.get
+        anno_get = self.annotations.get
+        parse_notes = self._parse_notes
+        parse_anno = self._parse_annotations_to_node_properties
+        use_anno = self.annotations_as_node_properties
 
-        # --- SBML reactions → process nodes ---
-        for rx in self.model.reactions:
+        for element in elements:
             props = {}
-            node_id = rx.id_
 
-            notes_base64 = self._parse_notes(self.notes.get(rx, None))
+            notes_base64 = parse_notes(notes_get(element, None))
             if notes_base64 is not None:
                 props["notes_base64"] = notes_base64
-            if rx.name is not None:
-                props["name"] = rx.name
-            if self.annotations_as_node_properties:
-                props.update(self._parse_annotations_to_node_properties(self.annotations.get(rx, None)))
-            yield (node_id, "process", props)
+            name = element.name
+            if name is not None:
+                props["name"] = name
+            if use_anno:
+                props.update(parse_anno(anno_get(element, None)))
+
+            yield (element.id_, label, props)
 
     # --------------------------------------------------------------
     # EDGES
@@ -123,8 +126,11 @@ class SBMLAdapter:
             (edge_id, source_id, target_id, input_label, properties_dict)
         """
 
+        model = self.model
+        reactions = model.reactions
+
         # --- Reactant / Product / Modifier edges (species ↔ reaction) ---
-        for rx in self.model.reactions:
+        for rx in reactions:
             rx_id = rx.id_
 
             # Reactants: species → reaction
@@ -171,10 +177,11 @@ class SBMLAdapter:
                 )
 
         # --- Species localization: contained entity edges (species → compartment) ---
-        for sp in self.model.species:
-            if sp.compartment:
+        for sp in model.species:
+            comp = sp.compartment
+            if comp:
                 species_id = sp.id_
-                comp_id = sp.compartment.id_
+                comp_id = comp.id_
                 edge_id = f"{species_id}_contained_entity_{comp_id}"
                 props: Dict[str, Any] = {}
                 yield (
@@ -207,15 +214,14 @@ class SBMLAdapter:
     @staticmethod
     def _parse_notes(notes: frozenset) -> str:
         """Parse notes from SBML elements."""
-        if notes is None:
+        if not notes:
             return None
 
-        # encode notes in base64 for compatibility with neo4j CSV import
-        for note in notes:
-            break
+        # several notes are joined in a stable order instead of keeping an arbitrary one
+        note = next(iter(notes)) if len(notes) == 1 else b"\n".join(sorted(notes))
 
-        note = base64.b64encode(note, altchars=None).decode()
-        return note
+        # encode notes in base64 for compatibility with neo4j CSV import
+        return b64encode(note).decode("ascii")
 
     @staticmethod
     def _parse_annotations_to_node_properties(annotations: frozenset) -> Dict[str, Any]:
@@ -253,6 +259,10 @@ class SBMLAdapter:
         """
         Check if SBML file exists and is readable.
 
+        The file is only parsed up to its root element (past any XML prolog,
+        DOCTYPE or comments) to check that it is <sbml>; the model parsed by
+        the constructor is reused rather than parsing the file again.
+
         Returns:
             True if valid, False otherwise.
         """
@@ -261,7 +271,15 @@ class SBMLAdapter:
             return False
 
         try:
-            sbml.SBMLReader.read(self.sbml_path)
+            context = etree.iterparse(
+                str(self.sbml_path), events=("start",), **ROOT_PARSE_OPTIONS
+            )
+            _, root = next(context)
+            del context
+            if etree.QName(root).localname != "sbml":
+                logger.error(f"No <sbml> root element found in {self.sbml_path}")
+                return False
+            self._ensure_loaded()
             return True
         except Exception as e:
             logger.error(f"Failed to parse SBML: {e}")
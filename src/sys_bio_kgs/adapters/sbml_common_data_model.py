@@ -1,6 +1,33 @@
+import functools
+import os
+from collections import namedtuple
+from itertools import chain, repeat
+
 import momapy.sbml.io.sbml
 import momapy.io
 
+# Emitted records; plain tuples in memory and on unpacking, with named fields
+Node = namedtuple("Node", "id label props")
+Relationship = namedtuple("Relationship", "id source target type props")
+
+# Node labels, relationship types and property keys
+_ENTITY = "entity"
+_COMPARTMENT = "compartment"
+_PROCESS = "process"
+_REACTANT = "reactant"
+_PRODUCT = "product"
+_MODIFIER = "modifier"
+_CONTAINED = "contained entity"
+_STOICH_KEY = "stoichiometry"
+_NAME_KEY = "name"
+
+
+# Parsed models are large, so only the most recent files are kept
+@functools.lru_cache(maxsize=2)
+def _read_sbml(path, mtime_ns, size):
+    """Parse an SBML file; the modification time and size key out stale entries."""
+    return momapy.io.read(path).obj
+
 
 class SBMLCommonSchemaAdapter(object):
     def __init__(self, file_path):
@@ -8,102 +35,121 @@ class SBMLCommonSchemaAdapter(object):
         self.obj = None
 
     def load(self):
-        self.obj = momapy.io.read(self.file_path).obj
-
-    def get_nodes_and_relationships(self):
-        if self.obj is None:
-            raise ValueError("model should be loaded first")
-        all_nodes = []
-        all_relationships = []
-        for species in self.obj.species:
-            nodes, relationships = self._make_nodes_and_relationsips_from_species(
-                species
-            )
-            all_nodes += nodes
-            all_relationships += relationships
-        for compartment in self.obj.compartments:
-            nodes, relationships = self._make_nodes_and_relationships_from_compartment(
-                compartment
-            )
-            all_nodes += nodes
-            all_relationships += relationships
-        for reaction in self.obj.reactions:
-            nodes, relationships = self._make_nodes_and_relationships_from_reaction(
-                reaction
-            )
-            all_nodes += nodes
-            all_relationships += relationships
-        return all_nodes, all_relationships
+        path = os.fspath(self.file_path)
+        st = os.stat(path)
+        self.obj = _read_sbml(path, st.st_mtime_ns, st.st_size)
 
     @classmethod
-    def _make_nodes_and_relationsips_from_species(cls, species):
-        nodes = [(species.id_, "entity", {"name": species.name})]
-        if species.compartment is not None:
-            relationships = [
-                (
-                    str(hash((species, species.compartment))),
-                    species.id_,
-                    species.compartment.id_,
-                    "contained entity",
-                    {},
-                )
-            ]
-        else:
-            relationships = []
-        return nodes, relationships
+    def clear_cache(cls):
+        """Drop the models parsed by load() across all instances."""
+        _read_sbml.cache_clear()
 
-    @classmethod
-    def _make_nodes_and_relationships_from_compartment(cls, compartment):
-        nodes = [(compartment.id_, "compartment", {"name": compartment.name})]
-        relationships = []
-        return nodes, relationships
+    def iter_nodes(self):
+        """Yield a Node for every species, compartment and reaction."""
+        obj = self.obj
+        if obj is None:
+            raise ValueError("model should be loaded first")
+        for species in obj.species:
+            yield Node(species.id_, _ENTITY, {_NAME_KEY: species.name})
+        for compartment in obj.compartments:
+            yield Node(compartment.id_, _COMPARTMENT, {_NAME_KEY: compartment.name})
+        for reaction in obj.reactions:
+            yield Node(reaction.id_, _PROCESS, {_NAME_KEY: reaction.name})
 
-    @classmethod
-    def _make_nodes_and_relationships_from_reaction(cls, reaction):
-        nodes = [(reaction.id_, "process", {"name": reaction.name})]
-        relationships = []
-        for reactant in reaction.reactants:
-            source_node_id = reactant.referred_species.id_
-            target_node_id = reaction.id_
-            if reactant.stoichiometry is not None:
-                properties = {"stoichiometry": reactant.stoichiometry}
-            else:
-                properties = {}
-            relationships.append(
-                (
-                    reactant.id_,
-                    source_node_id,
-                    target_node_id,
-                    "reactant",
-                    properties,
-                )
+    def iter_relationships(self):
+        """Yield a Relationship for every containment and reaction participant."""
+        obj = self.obj
+        if obj is None:
+            raise ValueError("model should be loaded first")
+        # Only species placed in a compartment get a containment relationship
+        for species in obj.species:
+            compartment = species.compartment
+            if compartment is None:
+                continue
+            species_id = species.id_
+            compartment_id = compartment.id_
+            yield Relationship(
+                f"contains:{species_id}:{compartment_id}",
+                species_id,
+                compartment_id,
+                _CONTAINED,
+                {},
             )
-        for product in reaction.products:
-            source_node_id = product.referred_species.id_
-            target_node_id = reaction.id_
-            if product.stoichiometry is not None:
-                properties = {"stoichiometry": product.stoichiometry}
-            else:
-                properties = {}
-            relationships.append(
-                (
-                    product.id_,
-                    source_node_id,
-                    target_node_id,
-                    "product",
-                    properties,
-                )
+        # Reaction participants, walked in one loop per reaction tagged by role
+        for reaction in obj.reactions:
+            reaction_id = reaction.id_
+            participants = chain(
+                zip(reaction.reactants, repeat(_REACTANT)),
+                zip(reaction.products, repeat(_PRODUCT)),
+                zip(reaction.modifiers, repeat(_MODIFIER)),
             )
-        for modifier in reaction.modifiers:
-            source_node_id = modifier.referred_species.id_
-            target_node_id = reaction.id_
-            relationships.append(
-                (
-                    modifier.id_,
-                    source_node_id,
-                    target_node_id,
-                    "modifier",
-                    {},
+            for participant, role in participants:
+                if role is not _MODIFIER:
+                    stoichiometry = participant.stoichiometry
+                else:
+                    stoichiometry = None
+                if stoichiometry is not None:
+                    properties = {_STOICH_KEY: stoichiometry}
+                else:
+                    properties = {}
+                yield Relationship(
+                    participant.id_,
+                    participant.referred_species.id_,
+                    reaction_id,
+                    role,
+                    properties,
                 )
-            )
-        return nodes, relationships
+
+    def get_nodes_and_relationships(self):
+        """Return (nodes, relationships) as lists.
+
+        Deprecated: iterate iter_nodes() and iter_relationships() instead, which
+        stream the same tuples without holding the whole graph in memory.
+        """
+        return list(self.iter_nodes()), list(self.iter_relationships())
+
+    def get_nodes_and_relationships_columnar(self):
+        """Return (node_columns, relationship_columns) as dicts of parallel lists.
+
+        The columns can be handed to pandas.DataFrame or pyarrow as they are:
+        node_id/node_label/node_props and relationship_id/source_id/target_id/
+        relationship_type/relationship_props.
+        """
+        node_ids, node_labels, node_props = [], [], []
+        add_id = node_ids.append
+        add_label = node_labels.append
+        add_props = node_props.append
+        for node_id, label, properties in self.iter_nodes():
+            add_id(node_id)
+            add_label(label)
+            add_props(properties)
+
+        rel_ids, source_ids, target_ids, rel_types, rel_props = [], [], [], [], []
+        add_rel_id = rel_ids.append
+        add_source = source_ids.append
+        add_target = target_ids.append
+        add_type = rel_types.append
+        add_rel_props = rel_props.append
+        for rel_id, source_id, target_id, rel_type, properties in (
+            self.iter_relationships()
+        ):
+            add_rel_id(rel_id)
+            add_source(source_id)
+            add_target(target_id)
+            add_type(rel_type)
+            add_rel_props(properties)
+
+        return (
+            {
+                "node_id": node_ids,
+                "node_label": node_labels,
+                "node_props": node_props,
+            },
+            {
+                "relationship_id": rel_ids,
+                "source_id": source_ids,
+                "target_id": target_ids,
+                "relationship_type": rel_types,
+                "relationship_props": rel_props,
+            },
+        )
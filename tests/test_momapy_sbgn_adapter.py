@@ -0,0 +1,152 @@
+"""
+Tests for MoMaPySBGNAdapter's streaming SBGN-ML reader.
+"""
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from schema_manager import SchemaManager
+from sys_bio_kgs.adapters.momapy_sbgn_adapter import MoMaPySBGNAdapter
+
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "Repressilator_PD_v7.sbgn"
+
+
+@pytest.fixture
+def adapter():
+    return MoMaPySBGNAdapter(DATA_FILE, force_alternative=True)
+
+
+class TestMoMaPySBGNAdapterXML:
+    """Test the lxml reader used with force_alternative."""
+
+    def test_node_and_edge_counts(self, adapter):
+        """Test that every glyph and arc of the map is read."""
+        nodes = list(adapter.get_nodes())
+        edges = list(adapter.get_edges())
+
+        assert len(nodes) == 32
+        assert len(edges) == 79
+        assert Counter(node[1] for node in nodes)["process"] == 12
+        edge_types = Counter(edge[3] for edge in edges)
+        assert edge_types["reactant"] == 12
+        assert edge_types["product"] == 12
+        assert edge_types["contained entity"] == 18
+
+    def test_ids_are_prefixed(self, adapter):
+        """Test that node and edge ids carry the adapter hash."""
+        prefix = adapter.hash_str + "_"
+        node_id, _, _ = next(adapter.get_nodes())
+        edge_id, source_id, target_id, _, _ = next(adapter.get_edges())
+
+        assert node_id.startswith(prefix)
+        assert all(i.startswith(prefix) for i in (edge_id, source_id, target_id))
+
+    def test_port_endpoints_resolve_to_process(self, adapter):
+        """Test that arcs pointing at a process port end at the process glyph."""
+        edges = {edge[0]: edge for edge in adapter._read_edges_raw()}
+        processes = {node[0] for node in adapter._read_nodes_raw() if node[3] == "process"}
+
+        # arc1: glyph3 -> port glyph4.2
+        assert edges["arc1"][1:4] == ("glyph3", "glyph4", "reactant")
+        for _, source_id, target_id, edge_type, _ in edges.values():
+            if edge_type == "reactant":
+                assert target_id in processes
+            elif edge_type == "product":
+                assert source_id in processes
+
+    def test_geometry_columns(self, adapter):
+        """Test that geometry has one float32 value per node or edge."""
+        geometry = adapter.get_geometry()
+
+        for key in ("x", "y", "width", "height", "area"):
+            assert geometry[key].shape == (32,)
+            assert geometry[key].dtype == "float32"
+        for key in ("start_x", "start_y", "end_x", "end_y", "length"):
+            assert geometry[key].shape == (79,)
+            assert geometry[key].dtype == "float32"
+
+    def test_missing_arc_coordinates(self, tmp_path):
+        """Test that an arc start without coordinates is read as None."""
+        sbgn = DATA_FILE.read_text().replace(
+            '<start y="65.5" x="353.74677"/>', '<start/>'
+        )
+        sbgn_file = tmp_path / "missing_start.sbgn"
+        sbgn_file.write_text(sbgn)
+
+        adapter = MoMaPySBGNAdapter(sbgn_file, force_alternative=True)
+        edges = {edge[0]: edge for edge in adapter._read_edges_raw()}
+
+        properties = edges["arc15"][4]
+        assert properties["start_x"] is None
+        assert properties["start_y"] is None
+        assert properties["end_x"] == pytest.approx(297.89154)
+
+
+class TestMoMaPySBGNAdapterSchema:
+    """Test the registration of node and edge types with a schema manager."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        schema_path = tmp_path / "schema.yaml"
+        schema_path.write_text("".join(
+            f"{name}:\n  represented_as: {kind}\n  input_label: {name}\n"
+            for name, kind in (
+                ("physical entity", "node"),
+                ("reactant", "edge"),
+                ("product", "edge"),
+                ("modifier", "edge"),
+            )
+        ))
+        return SchemaManager(schema_path)
+
+    def test_schema_populated_on_construction(self, manager):
+        """Test that the types are registered before any node or edge is read."""
+        MoMaPySBGNAdapter(DATA_FILE, schema_manager=manager, force_alternative=True)
+
+        assert manager.get_children("physical entity") == [
+            "macromolecule", "simple chemical", "empty set"
+        ]
+        assert manager.get_children("macromolecule") == ["information macromolecule"]
+        assert manager.get_children("reactant") == ["consumption"]
+        assert manager.get_children("modifier") == [
+            "inhibition", "necessary stimulation", "catalysis", "stimulation"
+        ]
+        assert "is_a" not in manager.schema["modifier"]
+
+    def test_reading_leaves_schema_alone(self, manager, monkeypatch):
+        """Test that streaming nodes and edges does not touch the schema manager."""
+        adapter = MoMaPySBGNAdapter(DATA_FILE, schema_manager=manager, force_alternative=True)
+
+        def add_child(*args, **kwargs):
+            raise AssertionError("schema changed while reading")
+
+        monkeypatch.setattr(manager, "add_child", add_child)
+        assert len(list(adapter.get_nodes())) == 32
+        assert len(list(adapter.get_edges())) == 79
+        adapter.get_geometry()
+
+
+class TestMoMaPySBGNAdapterFromDirectory:
+    """Test reading a directory of SBGN files in worker processes."""
+
+    def test_reads_every_file(self, tmp_path):
+        """Test that each file yields its nodes and edges."""
+        for name in ("a.sbgn", "b.sbgn"):
+            (tmp_path / name).write_bytes(DATA_FILE.read_bytes())
+
+        results = list(
+            MoMaPySBGNAdapter.from_directory(tmp_path, workers=2, force_alternative=True)
+        )
+
+        assert sorted(path.name for path, _, _ in results) == ["a.sbgn", "b.sbgn"]
+        for _, nodes, edges in results:
+            assert len(nodes) == 32
+            assert len(edges) == 79
+
+    def test_rejects_schema_manager_at_call(self, tmp_path):
+        """Test that a schema_manager is rejected before iteration starts."""
+        with pytest.raises(ValueError, match="schema_manager"):
+            MoMaPySBGNAdapter.from_directory(tmp_path, schema_manager=object())
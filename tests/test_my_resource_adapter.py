@@ -3,9 +3,6 @@ Tests for MyResourceAdapter.
 """
 
 import pytest
-from pathlib import Path
-import tempfile
-import pandas as pd
 
 from sys_bio_kgs.adapters.my_resource_adapter import MyResourceAdapter
 
@@ -39,49 +36,33 @@ class TestMyResourceAdapter:
         assert metadata["version"] == "0.1.0"
         assert metadata["adapter_class"] == "MyResourceAdapter"
     
-    def test_get_nodes_with_csv_file(self):
+    def test_get_nodes_with_csv_file(self, tmp_path):
         """Test node extraction from CSV file."""
         # Create a temporary CSV file
-        test_data = pd.DataFrame({
-            'id': ['1', '2', '3'],
-            'name': ['Protein A', 'Gene B', 'Compound C'],
-            'type': ['protein', 'gene', 'compound']
-        })
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_file = f.name
-        
-        try:
-            adapter = MyResourceAdapter(temp_file)
-            nodes = list(adapter.get_nodes())
-            
-            # Adapter now returns dummy data, not CSV data
-            # Check that nodes are tuples with 3 elements (node_id, node_label, properties_dict)
-            assert len(nodes) > 0
-            assert isinstance(nodes[0], tuple)
-            assert len(nodes[0]) == 3
-            node_id, node_label, properties = nodes[0]
-            assert isinstance(node_id, str)
-            assert isinstance(node_label, str)
-            assert isinstance(properties, dict)
-        finally:
-            Path(temp_file).unlink()
+        temp_file = tmp_path / "data.csv"
+        temp_file.write_text("id,name,type\n1,Protein A,protein\n2,Gene B,gene\n3,Compound C,compound\n")
+
+        adapter = MyResourceAdapter(str(temp_file))
+        nodes = list(adapter.get_nodes())
+
+        # Adapter now returns dummy data, not CSV data
+        # Check that nodes are tuples with 3 elements (node_id, node_label, properties_dict)
+        assert len(nodes) > 0
+        assert isinstance(nodes[0], tuple)
+        assert len(nodes[0]) == 3
+        node_id, node_label, properties = nodes[0]
+        assert isinstance(node_id, str)
+        assert isinstance(node_label, str)
+        assert isinstance(properties, dict)
     
-    def test_validate_data_source_with_existing_csv(self):
+    def test_validate_data_source_with_existing_csv(self, tmp_path):
         """Test data source validation with existing CSV file."""
         # Create a temporary CSV file
-        test_data = pd.DataFrame({'id': ['1'], 'name': ['test']})
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_file = f.name
-        
-        try:
-            adapter = MyResourceAdapter(temp_file)
-            assert adapter.validate_data_source() is True
-        finally:
-            Path(temp_file).unlink()
+        temp_file = tmp_path / "data.csv"
+        temp_file.write_text("id,name\n1,test\n")
+
+        adapter = MyResourceAdapter(str(temp_file))
+        assert adapter.validate_data_source() is True
     
     def test_validate_data_source_with_nonexistent_file(self):
         """Test data source validation with non-existent file."""
@@ -0,0 +1,160 @@
+"""
+Tests for SBMLCommonSchemaAdapter's node and relationship streams and model cache.
+"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from sys_bio_kgs.adapters import sbml_common_data_model
+from sys_bio_kgs.adapters.sbml_common_data_model import SBMLCommonSchemaAdapter
+
+
+def make_model():
+    """A small SBML-like model: two species, one compartment, one reaction."""
+    cytosol = SimpleNamespace(id_="c1", name="cytosol")
+    glucose = SimpleNamespace(id_="s1", name="glucose", compartment=cytosol)
+    atp = SimpleNamespace(id_="s2", name="ATP", compartment=None)
+    reaction = SimpleNamespace(
+        id_="r1",
+        name="hexokinase",
+        reactants=[SimpleNamespace(id_="sr1", referred_species=glucose, stoichiometry=2.0)],
+        products=[SimpleNamespace(id_="sr2", referred_species=atp, stoichiometry=None)],
+        # Modifier references carry no stoichiometry attribute
+        modifiers=[SimpleNamespace(id_="msr1", referred_species=atp)],
+    )
+    return SimpleNamespace(species=[glucose, atp], compartments=[cytosol], reactions=[reaction])
+
+
+@pytest.fixture
+def adapter():
+    adapter = SBMLCommonSchemaAdapter("unused.xml")
+    adapter.obj = make_model()
+    return adapter
+
+
+class TestSBMLCommonSchemaAdapterStreams:
+    """Test iter_nodes/iter_relationships and the list and columnar wrappers."""
+
+    def test_nodes(self, adapter):
+        """Test that species, compartments and reactions are emitted in that order."""
+        assert list(adapter.iter_nodes()) == [
+            ("s1", "entity", {"name": "glucose"}),
+            ("s2", "entity", {"name": "ATP"}),
+            ("c1", "compartment", {"name": "cytosol"}),
+            ("r1", "process", {"name": "hexokinase"}),
+        ]
+
+    def test_relationships(self, adapter):
+        """Test containment and participant relationships, ids and types."""
+        assert list(adapter.iter_relationships()) == [
+            ("contains:s1:c1", "s1", "c1", "contained entity", {}),
+            ("sr1", "s1", "r1", "reactant", {"stoichiometry": 2.0}),
+            ("sr2", "s2", "r1", "product", {}),
+            ("msr1", "s2", "r1", "modifier", {}),
+        ]
+
+    def test_stoichiometry_only_when_set(self, adapter):
+        """Test that the stoichiometry key is present only when a value is set."""
+        props = {rel.id: rel.props for rel in adapter.iter_relationships()}
+
+        assert props["sr1"] == {"stoichiometry": 2.0}
+        assert "stoichiometry" not in props["sr2"]
+        assert "stoichiometry" not in props["msr1"]
+
+    def test_props_are_independent(self, adapter):
+        """Test that every relationship gets its own property dict."""
+        relationships = list(adapter.iter_relationships())
+
+        assert len({id(rel.props) for rel in relationships}) == len(relationships)
+
+    def test_list_wrapper_matches_generators(self, adapter):
+        """Test that the deprecated list wrapper returns the streamed tuples."""
+        nodes, relationships = adapter.get_nodes_and_relationships()
+
+        assert nodes == list(adapter.iter_nodes())
+        assert relationships == list(adapter.iter_relationships())
+
+    def test_columnar_matches_generators(self, adapter):
+        """Test that the columns have one entry per record, in stream order."""
+        node_columns, rel_columns = adapter.get_nodes_and_relationships_columnar()
+        nodes, relationships = adapter.get_nodes_and_relationships()
+
+        assert {len(column) for column in node_columns.values()} == {len(nodes)}
+        assert {len(column) for column in rel_columns.values()} == {len(relationships)}
+        assert list(zip(*node_columns.values())) == nodes
+        assert list(zip(*rel_columns.values())) == relationships
+
+    def test_requires_load(self):
+        """Test that reading before load() raises ValueError."""
+        adapter = SBMLCommonSchemaAdapter("unused.xml")
+
+        with pytest.raises(ValueError):
+            next(adapter.iter_nodes())
+        with pytest.raises(ValueError):
+            next(adapter.iter_relationships())
+
+
+class TestSBMLCommonSchemaAdapterCache:
+    """Test the parsed-model cache behind load()."""
+
+    @pytest.fixture
+    def reads(self, monkeypatch):
+        """Record the paths parsed, returning a fresh stub model for each parse."""
+        paths = []
+
+        def read(path):
+            paths.append(path)
+            return SimpleNamespace(obj=make_model())
+
+        SBMLCommonSchemaAdapter.clear_cache()
+        monkeypatch.setattr(sbml_common_data_model.momapy.io, "read", read)
+        yield paths
+        SBMLCommonSchemaAdapter.clear_cache()
+
+    @pytest.fixture
+    def sbml_file(self, tmp_path):
+        path = tmp_path / "model.xml"
+        path.write_text("<sbml/>")
+        return path
+
+    @staticmethod
+    def load(path):
+        adapter = SBMLCommonSchemaAdapter(path)
+        adapter.load()
+        return adapter.obj
+
+    def test_unchanged_file_is_parsed_once(self, reads, sbml_file):
+        """Test that instances share the model of an unchanged file."""
+        assert self.load(sbml_file) is self.load(sbml_file)
+        assert len(reads) == 1
+
+    def test_mtime_change_invalidates(self, reads, sbml_file):
+        """Test that touching the file makes load() parse it again."""
+        first = self.load(sbml_file)
+        stat = sbml_file.stat()
+        os.utime(sbml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert self.load(sbml_file) is not first
+        assert len(reads) == 2
+
+    def test_size_change_invalidates(self, reads, sbml_file):
+        """Test that rewriting the file with the same mtime still parses it again."""
+        first = self.load(sbml_file)
+        stat = sbml_file.stat()
+        sbml_file.write_text("<sbml></sbml>")
+        os.utime(sbml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert self.load(sbml_file) is not first
+        assert len(reads) == 2
+
+    def test_cache_is_bounded(self, reads, tmp_path):
+        """Test that only the most recently loaded models stay cached."""
+        paths = [tmp_path / f"model{i}.xml" for i in range(3)]
+        for path in paths:
+            path.write_text("<sbml/>")
+            self.load(path)
+
+        self.load(paths[0])
+        assert len(reads) == 4
@@ -0,0 +1,231 @@
+"""
+Tests for SchemaManager's children index.
+"""
+
+import os
+import pickle
+
+import pytest
+
+from schema_manager import SchemaManager
+
+
+SCHEMA_YAML = """\
+physical entity:
+  represented_as: node
+  input_label: physical entity
+process:
+  represented_as: node
+  input_label: process
+contained entity:
+  represented_as: edge
+  input_label: contained entity
+zz1:
+  represented_as: node
+  input_label: zz1
+zz2:
+  is_a: physical entity
+  represented_as: node
+  input_label: zz2
+"""
+
+
+def rescan_children(manager, parent):
+    """Children of parent in schema order, found by scanning every node."""
+    return [
+        name for name, config in manager.schema.items()
+        if isinstance(config, dict) and config.get('is_a') == parent
+    ]
+
+
+def rescan_roots(manager):
+    """Root nodes in schema order, found by scanning every node."""
+    return [
+        name for name, config in manager.schema.items()
+        if isinstance(config, dict) and 'is_a' not in config
+    ]
+
+
+def assert_index_matches_schema(manager):
+    """The children index and root list must agree with a rescan of the schema."""
+    for parent in manager.schema:
+        assert manager.get_children(parent) == rescan_children(manager, parent)
+    assert manager._roots == rescan_roots(manager)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    schema_path = tmp_path / "schema.yaml"
+    schema_path.write_text(SCHEMA_YAML)
+    return SchemaManager(schema_path)
+
+
+class TestSchemaManagerIndex:
+    """Test that the children index follows schema edits."""
+
+    def test_initial_index(self, manager):
+        """Test that the index built on load matches the schema."""
+        assert manager.get_children('physical entity') == ['zz2']
+        assert_index_matches_schema(manager)
+
+    def test_add_child(self, manager):
+        """Test that new children are appended in schema order."""
+        manager.add_child('physical entity', 'protein').add_child('process', 'catalysis')
+        manager.add_child('physical entity', 'gene')
+
+        assert manager.get_children('physical entity') == ['zz2', 'protein', 'gene']
+        assert_index_matches_schema(manager)
+
+    def test_overwrite_with_same_parent(self, manager):
+        """Test that overwriting a child under the same parent keeps its position."""
+        manager.add_child('physical entity', 'protein')
+        manager.add_child('physical entity', 'zz2', properties={'weight': 'float'})
+
+        assert manager.get_children('physical entity') == ['zz2', 'protein']
+        assert_index_matches_schema(manager)
+
+    def test_reparent_keeps_schema_order(self, manager):
+        """Test that re-parented nodes are listed in their schema position."""
+        manager.add_child('zz1', 'zz2')
+        manager.add_child('zz1', 'contained entity')
+
+        assert manager.get_children('zz1') == ['contained entity', 'zz2']
+        assert manager.get_children('physical entity') == []
+        assert 'contained entity' not in manager._roots
+        assert_index_matches_schema(manager)
+
+    def test_remove_child(self, manager):
+        """Test that removed nodes disappear from the index and root list."""
+        manager.add_child('physical entity', 'protein')
+        manager.remove_child('zz2').remove_child('zz1').remove_child('missing')
+
+        assert manager.get_children('physical entity') == ['protein']
+        assert_index_matches_schema(manager)
+
+    def test_add_children_batch(self, manager):
+        """Test batches with new, duplicate and re-parented children."""
+        manager.add_children('zz1', [
+            'protein',
+            'zz2',
+            ('protein', {'properties': {'weight': 'float'}}),
+            'contained entity',
+            'gene',
+        ])
+
+        assert manager.get_children('zz1') == ['contained entity', 'zz2', 'protein', 'gene']
+        assert manager.schema['protein']['properties'] == {'weight': 'float'}
+        assert_index_matches_schema(manager)
+
+    def test_add_children_bad_spec_changes_nothing(self, manager):
+        """Test that a failing spec mid-batch leaves the schema and index untouched."""
+        before = {name: dict(config) for name, config in manager.schema.items()}
+
+        with pytest.raises(TypeError):
+            manager.add_children('zz1', [
+                'protein',
+                'zz2',
+                ('gene', {'unexpected': True}),
+                'contained entity',
+            ])
+
+        assert manager.schema == before
+        assert manager.get_children('physical entity') == ['zz2']
+        assert manager.get_children('zz1') == []
+        assert_index_matches_schema(manager)
+
+    def test_index_matches_saved_schema(self, manager, tmp_path):
+        """Test that the index order matches the order written to YAML."""
+        manager.add_child('zz1', 'zz2')
+        manager.add_child('zz1', 'contained entity')
+        manager.add_child('zz1', 'protein')
+
+        reloaded = SchemaManager(manager.save(tmp_path / "out.yaml"))
+        assert reloaded.get_children('zz1') == manager.get_children('zz1')
+
+
+class TestSchemaManagerSaveJson:
+    """Test the output paths chosen by save_json."""
+
+    @pytest.mark.parametrize("name, expected", [
+        (None, "schema.json"),
+        ("out.yaml", "out.json"),
+        ("out", "out.json"),
+        ("out.json", "out.json"),
+    ])
+    def test_suffix_is_replaced(self, manager, tmp_path, name, expected):
+        """Test that a non-JSON suffix is replaced, not extended."""
+        saved = manager.save_json(None if name is None else tmp_path / name)
+        assert saved == tmp_path / expected
+        assert saved.exists()
+
+
+class TestSchemaManagerCache:
+    """Test the pickle sidecar written next to the schema YAML."""
+
+    @pytest.fixture
+    def schema_path(self, tmp_path):
+        path = tmp_path / "schema.yaml"
+        path.write_text(SCHEMA_YAML)
+        return path
+
+    @staticmethod
+    def write_sidecar(schema_path, schema):
+        """Write a sidecar for the current YAML file version holding schema."""
+        stat = schema_path.stat()
+        (schema_path.parent / "schema.yaml.pkl").write_bytes(
+            pickle.dumps((stat.st_mtime_ns, stat.st_size, schema))
+        )
+
+    def test_miss_writes_sidecar(self, schema_path):
+        """Test that a missing sidecar is created from the parsed YAML."""
+        manager = SchemaManager(schema_path)
+
+        mtime_ns, size, schema = pickle.loads((schema_path.parent / "schema.yaml.pkl").read_bytes())
+        stat = schema_path.stat()
+        assert (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size)
+        assert schema == manager.schema
+        assert list(schema) == ['physical entity', 'process', 'contained entity', 'zz1', 'zz2']
+
+    def test_hit_skips_yaml(self, schema_path):
+        """Test that a fresh sidecar is used instead of the YAML."""
+        self.write_sidecar(schema_path, {'cached': {'represented_as': 'node'}})
+
+        assert list(SchemaManager(schema_path).schema) == ['cached']
+
+    def test_stale_after_content_edit(self, schema_path):
+        """Test that a size change makes the sidecar stale."""
+        self.write_sidecar(schema_path, {'cached': {'represented_as': 'node'}})
+        stat = schema_path.stat()
+        schema_path.write_text(SCHEMA_YAML + "extra:\n  represented_as: node\n")
+        os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        schema = SchemaManager(schema_path).schema
+        assert 'cached' not in schema
+        assert 'extra' in schema
+
+    def test_stale_after_mtime_change(self, schema_path):
+        """Test that an mtime change makes the sidecar stale even at the same size."""
+        self.write_sidecar(schema_path, {'cached': {'represented_as': 'node'}})
+        stat = schema_path.stat()
+        os.utime(schema_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        manager = SchemaManager(schema_path)
+        assert 'cached' not in manager.schema
+        assert manager.get_children('physical entity') == ['zz2']
+
+    @pytest.mark.parametrize("payload", [
+        b"not a pickle",
+        pickle.dumps((1, 2, {}))[:-3],
+        pickle.dumps((1, 2)),
+        b"cno_such_module\nLoader\n.",
+        b"cbuiltins\nno_such_name\n.",
+    ], ids=["garbage", "truncated", "wrong-shape", "missing-module", "missing-attribute"])
+    def test_corrupt_sidecar_falls_back(self, schema_path, payload):
+        """Test that an unreadable sidecar is ignored and rewritten."""
+        cache_path = schema_path.parent / "schema.yaml.pkl"
+        cache_path.write_bytes(payload)
+
+        manager = SchemaManager(schema_path)
+
+        assert manager.get_children('physical entity') == ['zz2']
+        assert pickle.loads(cache_path.read_bytes())[2] == manager.schema